@@ -4,13 +4,14 @@
 jsonld_csv_converter_v5.py
 
 Methodology v5 converter:
-- Reads OWL/RDF JSON-LD (list of node objects) for *structure* (links, risk/assessment graph, labels if present)
+- Reads OWL/RDF JSON-LD (list of node objects) for *structure* (links, risk/assessment graph, labels if present);
+  nodes are streamed and reduced to the predicates used below
 - Reads hazards.csv for *content* (names, groups, keywords/altLabel, sources, hasSampleData, extra link columns)
 - Merges both into LLM/BM25-friendly "hazard cards" JSON (stable CURIE ids + auto verbalization)
 
 Inputs (per your v5 notes):
 - JSON-LD: hazard_ontology_v5.jsonld
-- CSV: hazards.csv
+- CSV: hazards.csv (or the curated hazards.xlsx directly, --sheet selects the worksheet; needs openpyxl)
   * keywords live in CSV as "Keywords" + "Keywords (German)" (treated like altLabel/keywords)
   * sources live in CSV as "Source" (and sometimes also in JSON-LD as dc:source)
   * sample data lives in CSV as "hasSampleData" (and sometimes also in JSON-LD as hazards:hasSampleData)
@@ -28,18 +29,23 @@ Usage:
       hazards.csv \
       hazard_cards_v5.json
 
+  Add --incremental to reuse unchanged cards from an existing output: per-card hashes of the CSV
+  row(s), the ontology hazard node and every referenced id (label, risk/assessment predicates) are
+  kept in <output>.state.json; only cards with a changed hash are rebuilt and re-verbalized.
+
 Notes:
 - IDs remain stable CURIEs; we do NOT "string replace" ids with text.
 - Verbalization is generated via generic predicate templates + labels/derived labels.
 """
 
 import argparse
+import csv
+import hashlib
 import json
 import math
+import os
 import re
-from typing import Any, Dict, List, Optional, Tuple
-
-import pandas as pd
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 # -------------------- IRI constants --------------------
@@ -92,6 +98,20 @@ CSV_LINK_COLS: Dict[str, str] = {
     "atLocation IDs": "atLocation",
 }
 
+# JSON-LD keys the converter reads; load_ontology() drops every other predicate while streaming
+JSONLD_KEEP_KEYS = frozenset({
+    ID, RDF_TYPE, RDFS_LABEL, SKOS_PREFLABEL, SKOS_ALTLABEL, DC_TERMS_SOURCE, DC_ELEM_SOURCE, HAS_SAMPLE_DATA,
+    *PREDICATE_MAP, *RISK_PREDICATE_MAP, *ASSESSMENT_PREDICATE_MAP,
+})
+JSONLD_CHUNK_CHARS = 1 << 20
+
+# CSV cells read as missing (pandas.read_csv default na_values); they become NaN like in pandas
+CSV_NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+CSV_REQUIRED_COLS = ["Hazard ID", "Hazard Name"]
+
 TEMPLATES_EN: Dict[str, str] = {
     # core
     "atLocation": "Location: {items}.",
@@ -244,14 +264,79 @@ def unique_preserve(items: List[str]) -> List[str]:
     return out
 
 
-def build_index(nodes: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+def build_index(
+    nodes: Iterable[Dict[str, Any]],
+    keep: Optional[frozenset] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """@id -> node; with `keep`, nodes are reduced to those keys (later duplicates win)."""
     idx: Dict[str, Dict[str, Any]] = {}
     for n in nodes:
         if isinstance(n, dict) and ID in n:
-            idx[n[ID]] = n
+            idx[n[ID]] = n if keep is None else {k: v for k, v in n.items() if k in keep}
     return idx
 
 
+def iter_jsonld_nodes(jsonld_path: str, chunk_chars: int = JSONLD_CHUNK_CHARS) -> Iterator[Any]:
+    """
+    Yields the elements of a top-level JSON-LD list one at a time (JSONDecoder.raw_decode over
+    chunks), so only the current node and one chunk are held besides what the caller keeps.
+    """
+    decoder = json.JSONDecoder()
+    with open(jsonld_path, "r", encoding="utf-8") as f:
+        buf = f.read(chunk_chars)
+        eof = not buf
+        pos = 0
+
+        def _skip(chars: str) -> None:
+            # advance pos past `chars`, reading further chunks as needed
+            nonlocal buf, pos, eof
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                buf, pos = f.read(chunk_chars), 0
+                eof = not buf
+
+        _skip(" \t\r\n")
+        if pos >= len(buf) or buf[pos] != "[":
+            raise SystemExit("Expected JSON-LD as a list of node objects at top-level.")
+        pos += 1
+        first = True
+        while True:
+            _skip(" \t\r\n")
+            if pos >= len(buf):
+                raise SystemExit(f"{jsonld_path}: unexpected end of JSON-LD list")
+            if buf[pos] == "]":
+                # like json.load: only whitespace may follow the top-level list
+                pos += 1
+                _skip(" \t\r\n")
+                if pos < len(buf):
+                    raise SystemExit(f"{jsonld_path}: unexpected data after the JSON-LD list")
+                return
+            if not first:
+                if buf[pos] != ",":
+                    raise SystemExit(f"{jsonld_path}: expected ',' between JSON-LD nodes")
+                pos += 1
+                _skip(" \t\r\n")
+            first = False
+            while True:
+                try:
+                    node, end = decoder.raw_decode(buf, pos)
+                    # a number cut by the chunk end still decodes ("4." -> 4): only accept a
+                    # value that is followed by a delimiter (or the end of the file)
+                    if eof or (end < len(buf) and buf[end] in " \t\r\n,]"):
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                more = f.read(chunk_chars)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+            pos = end
+            yield node
+
+
 def build_label_map_curie(idx: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
     labels: Dict[str, str] = {}
     for iri, node in idx.items():
@@ -360,21 +445,178 @@ def extract_ontology_hazards(idx: Dict[str, Dict[str, Any]], labels_by_curie: Di
     return out
 
 
+def _dedupe_columns(header: List[str]) -> List[str]:
+    # pandas mangles repeated names: X, X.1, X.2, ...
+    seen: Dict[str, int] = {}
+    out = []
+    for name in header:
+        n = seen.get(name, 0)
+        out.append(name if n == 0 else f"{name}.{n}")
+        seen[name] = n + 1
+    return out
+
+
+def _check_required_columns(columns: List[str]) -> None:
+    # basic validation / helpful error
+    for c in CSV_REQUIRED_COLS:
+        if c not in columns:
+            raise SystemExit(f"CSV missing required column: {c}")
+
+
+def iter_csv_rows(csv_path: str) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    """
+    Streams hazards.csv: (columns, row tuples) with the csv module, one row in memory at a time.
+    Cells are str, or NaN for pandas' default NA strings (short rows are padded with NaN), so the
+    card fields match the former pandas.read_csv path. Unlike pandas, all-numeric columns are not
+    converted to numbers (no card column is numeric).
+    """
+    f = open(csv_path, "r", encoding="utf-8-sig", newline="")
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        f.close()
+        raise SystemExit(f"CSV is empty: {csv_path}")
+    columns = _dedupe_columns(header)
+    try:
+        _check_required_columns(columns)
+    except SystemExit:
+        f.close()
+        raise
+
+    def _rows() -> Iterator[Tuple[Any, ...]]:
+        nan = float("nan")
+        width = len(columns)
+        with f:
+            for line_no, cells in enumerate(reader, start=2):
+                if not cells:
+                    continue  # blank line (skip_blank_lines)
+                if len(cells) > width:
+                    raise SystemExit(f"{csv_path}:{line_no}: expected {width} fields, saw {len(cells)}")
+                row = tuple(nan if c in CSV_NA_VALUES else c for c in cells)
+                yield row + (nan,) * (width - len(row))
+
+    return columns, _rows()
+
+
+def _xlsx_cell(v: Any) -> Any:
+    # same cell values as a pandas CSV export of the sheet read back by iter_csv_rows
+    if v is None:
+        return float("nan")
+    if isinstance(v, str):
+        return float("nan") if v in CSV_NA_VALUES else v
+    if isinstance(v, float) and math.isnan(v):
+        return v
+    return str(v)
+
+
+def iter_xlsx_rows(xlsx_path: str, sheet: str = "") -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    """
+    Streams one worksheet of hazards.xlsx (openpyxl read-only, values only): same (columns, row
+    tuples) contract as iter_csv_rows. `sheet` is a sheet name or 0-based index (default: first).
+    Fully empty rows are skipped (in a CSV export they would read as a Hazard ID "nan" card).
+    """
+    try:
+        from openpyxl import load_workbook
+    except Exception as e:
+        raise SystemExit("Reading .xlsx needs openpyxl. Install with: pip install openpyxl") from e
+
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        names = wb.sheetnames
+        if not sheet:
+            ws = wb[names[0]]
+        elif sheet in names:
+            ws = wb[sheet]
+        elif sheet.isdigit() and int(sheet) < len(names):
+            ws = wb[names[int(sheet)]]
+        else:
+            raise SystemExit(f"{xlsx_path}: no sheet {sheet!r} (sheets: {', '.join(names)})")
+
+        it = ws.iter_rows(values_only=True)
+        header = next(it, None)
+        if header is None:
+            raise SystemExit(f"Sheet is empty: {xlsx_path} [{ws.title}]")
+        header = list(header)
+        while header and header[-1] is None:
+            header.pop()  # read-only dimensions often include empty trailing columns
+        columns = _dedupe_columns([f"Unnamed: {i}" if h is None else str(h) for i, h in enumerate(header)])
+        _check_required_columns(columns)
+    except BaseException:
+        wb.close()
+        raise
+
+    def _rows() -> Iterator[Tuple[Any, ...]]:
+        nan = float("nan")
+        width = len(columns)
+        try:
+            for row_no, cells in enumerate(it, start=2):
+                if all(c is None for c in cells):
+                    continue
+                if any(c is not None for c in cells[width:]):
+                    raise SystemExit(f"{xlsx_path} [{ws.title}] row {row_no}: value outside the {width} header columns")
+                row = tuple(_xlsx_cell(c) for c in cells[:width])
+                yield row + (nan,) * (width - len(row))
+        finally:
+            wb.close()
+
+    return columns, _rows()
+
+
+def iter_table_rows(path: str, sheet: str = "") -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    """hazards.csv or a worksheet of hazards.xlsx/.xlsm, by file extension."""
+    if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm"):
+        return iter_xlsx_rows(path, sheet)
+    if sheet:
+        raise SystemExit(f"--sheet only applies to .xlsx input, not {path}")
+    return iter_csv_rows(path)
+
+
+def load_csv_rows(csv_path: str, sheet: str = "") -> Tuple[List[str], List[Tuple[Any, ...]]]:
+    """(columns, all row tuples) of hazards.csv / hazards.xlsx."""
+    columns, rows = iter_table_rows(csv_path, sheet)
+    return columns, list(rows)
+
+
+def csv_row_hazard_id(row: Tuple[Any, ...], id_pos: int) -> str:
+    return str(row[id_pos]).strip()
+
+
 def merge_csv_into_cards(
     cards: Dict[str, Dict[str, Any]],
     csv_path: str,
     labels_by_curie: Dict[str, str],
+    sheet: str = "",
 ) -> Dict[str, Dict[str, Any]]:
-    df = pd.read_csv(csv_path)
+    columns, rows = iter_table_rows(csv_path, sheet)
+    return merge_csv_rows_into_cards(cards, columns, rows)
 
-    # basic validation / helpful error
-    required_cols = ["Hazard ID", "Hazard Name"]
-    for c in required_cols:
-        if c not in df.columns:
-            raise SystemExit(f"CSV missing required column: {c}")
 
-    for _, row in df.iterrows():
-        hazard_id = str(row.get("Hazard ID")).strip()
+def merge_csv_rows_into_cards(
+    cards: Dict[str, Dict[str, Any]],
+    columns: List[str],
+    rows: Iterable[Tuple[Any, ...]],
+) -> Dict[str, Dict[str, Any]]:
+    # column positions resolved once; absent optional columns read as None
+    pos = {c: i for i, c in enumerate(columns)}
+    id_pos = pos["Hazard ID"]
+    name_pos = pos["Hazard Name"]
+    meta_cols = [
+        (pos[col], out_key)
+        for col, out_key in [
+            ("Description", "description"),
+            ("Hazard Group", "group"),
+            ("Hazard Subtype", "subtype"),
+        ]
+        if col in pos
+    ]
+    kw_en_pos = pos.get("Keywords")
+    kw_de_pos = pos.get("Keywords (German)")
+    src_pos = pos.get("Source")
+    sd_pos = pos.get("hasSampleData")
+    link_cols = [(pos[csv_col], link_key) for csv_col, link_key in CSV_LINK_COLS.items() if csv_col in pos]
+
+    for row in rows:
+        hazard_id = csv_row_hazard_id(row, id_pos)
         if not hazard_id:
             continue
 
@@ -389,24 +631,20 @@ def merge_csv_into_cards(
         })
 
         # --- content fields from CSV ---
-        name_en = row.get("Hazard Name")
+        name_en = row[name_pos]
         if name_en is not None and not is_nan(name_en) and str(name_en).strip():
             card.setdefault("labels", {})
             card["labels"]["en"] = str(name_en).strip()
 
         # optional metadata
-        for col, out_key in [
-            ("Description", "description"),
-            ("Hazard Group", "group"),
-            ("Hazard Subtype", "subtype"),
-        ]:
-            val = row.get(col)
+        for i, out_key in meta_cols:
+            val = row[i]
             if val is not None and not is_nan(val) and str(val).strip():
                 card[out_key] = str(val).strip()
 
         # keywords (treated as altLabel/keywords)
-        kw_en = split_semicolon_list(row.get("Keywords"))
-        kw_de = split_semicolon_list(row.get("Keywords (German)"))
+        kw_en = split_semicolon_list(row[kw_en_pos] if kw_en_pos is not None else None)
+        kw_de = split_semicolon_list(row[kw_de_pos] if kw_de_pos is not None else None)
 
         # store language-keyed altLabel
         alt = card.get("altLabel") or {}
@@ -422,12 +660,12 @@ def merge_csv_into_cards(
             card["keywords"] = flat_keywords
 
         # sources
-        src = row.get("Source")
+        src = row[src_pos] if src_pos is not None else None
         if src is not None and not is_nan(src) and str(src).strip():
             card["sources"] = unique_preserve((card.get("sources") or []) + [str(src).strip()])
 
         # sample data
-        sd = row.get("hasSampleData")
+        sd = row[sd_pos] if sd_pos is not None else None
         if sd is not None and not is_nan(sd) and str(sd).strip():
             card["sampleData"] = unique_preserve((card.get("sampleData") or []) + [str(sd).strip()])
 
@@ -435,10 +673,8 @@ def merge_csv_into_cards(
         links = card.get("links") or {}
 
         # merge any csv-specified link lists (these are CURIEs already)
-        for csv_col, link_key in CSV_LINK_COLS.items():
-            if csv_col not in df.columns:
-                continue
-            items = split_semicolon_list(row.get(csv_col))
+        for i, link_key in link_cols:
+            items = split_semicolon_list(row[i])
             if not items:
                 continue
             links[link_key] = unique_preserve((links.get(link_key) or []) + items)
@@ -566,21 +802,24 @@ def finalize_verbalization(cards: Dict[str, Dict[str, Any]], labels_by_curie: Di
                 card["risk"]["assessment"]["verbalized_en"] = averb
 
 
-def convert(jsonld_path: str, csv_path: str) -> Dict[str, Any]:
-    # load JSON-LD
-    with open(jsonld_path, "r", encoding="utf-8") as f:
-        nodes = json.load(f)
-    if not isinstance(nodes, list):
-        raise SystemExit("Expected JSON-LD as a list of node objects at top-level.")
+def load_ontology(jsonld_path: str) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    (node index by IRI, labels by CURIE) of the JSON-LD file. Nodes are streamed and only the
+    predicates in JSONLD_KEEP_KEYS are kept, so memory follows the retained data, not the file.
+    """
+    idx = build_index(iter_jsonld_nodes(jsonld_path), keep=JSONLD_KEEP_KEYS)
+    return idx, build_label_map_curie(idx)
 
-    idx = build_index(nodes)
-    labels_by_curie = build_label_map_curie(idx)
+
+def convert(jsonld_path: str, csv_path: str, sheet: str = "") -> Dict[str, Any]:
+    # load JSON-LD
+    idx, labels_by_curie = load_ontology(jsonld_path)
 
     # 1) structure-first cards from ontology
     cards = extract_ontology_hazards(idx, labels_by_curie)
 
     # 2) merge CSV content + v5 link columns
-    cards = merge_csv_into_cards(cards, csv_path, labels_by_curie)
+    cards = merge_csv_into_cards(cards, csv_path, labels_by_curie, sheet)
 
     # 3) enrich hazard->risk->assessment from ontology graph where possible
     enrich_risk_assessment_from_ontology(cards, idx, labels_by_curie)
@@ -588,16 +827,28 @@ def convert(jsonld_path: str, csv_path: str) -> Dict[str, Any]:
     # 4) finalize verbalization + bm25 text
     finalize_verbalization(cards, labels_by_curie)
 
+    return cards_document(jsonld_path, csv_path, cards, sheet)
+
+
+def cards_document(
+    jsonld_path: str,
+    csv_path: str,
+    cards: Dict[str, Dict[str, Any]],
+    sheet: str = "",
+) -> Dict[str, Any]:
     hazards_sorted = sorted(cards.values(), key=lambda x: x.get("id", ""))
+    inputs = {
+        "jsonld": jsonld_path,
+        "csv": csv_path,
+    }
+    if sheet:
+        inputs["sheet"] = sheet
 
     return {
         "meta": {
             "schema_version": "hazard-cards-v5",
             "namespaces": {HAZARDS_PREFIX[:-1]: HAZARDS_BASE},
-            "inputs": {
-                "jsonld": jsonld_path,
-                "csv": csv_path,
-            },
+            "inputs": inputs,
             "notes": (
                 "Merged ontology (structure) + hazards.csv (content). "
                 "Keywords are sourced from CSV and stored as skos-like altLabel plus a flattened keywords list. "
@@ -610,18 +861,168 @@ def convert(jsonld_path: str, csv_path: str) -> Dict[str, Any]:
     }
 
 
+# -------------------- incremental rebuild --------------------
+# State file next to the output: per card the digest of its inputs (ontology hazard node + CSV rows)
+# and of every id it references (label + risk/assessment predicates). A card is reused from the
+# previous output only if all of them are unchanged, so a relabelled link target re-renders every
+# card that cites it. Bump STATE_VERSION when the card pipeline changes.
+STATE_VERSION = 1
+
+
+def _digest(obj: Any) -> str:
+    raw = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def card_references(card: Dict[str, Any]) -> List[str]:
+    """Ids whose labels/nodes the card's links, risk block and verbalizations were built from."""
+    refs: List[str] = [i for items in (card.get("links") or {}).values() for i in items]
+    risk = card.get("risk")
+    if isinstance(risk, dict):
+        refs.append(risk.get("id"))
+        refs.extend(i for items in (risk.get("links") or {}).values() for i in items)
+        assessment = risk.get("assessment")
+        if isinstance(assessment, dict):
+            refs.append(assessment.get("id"))
+            refs.extend(i for items in (assessment.get("links") or {}).values() for i in items)
+    return unique_preserve([str(r) for r in refs if r])
+
+
+def reference_digest(ref: str, idx: Dict[str, Dict[str, Any]], labels_by_curie: Dict[str, str]) -> str:
+    cur = iri_to_curie(ref) if ref.startswith("http") else ref
+    iri = HAZARDS_BASE + curie_or_iri_local_name(cur) if cur.startswith(HAZARDS_PREFIX) else cur
+    node = idx.get(iri) or {}
+    preds = {p: node[p] for p in (*RISK_PREDICATE_MAP, *ASSESSMENT_PREDICATE_MAP) if p in node}
+    return _digest([labels_by_curie.get(cur), preds])
+
+
+def convert_incremental(
+    jsonld_path: str,
+    csv_path: str,
+    previous: Optional[Dict[str, Any]] = None,
+    state: Optional[Dict[str, Any]] = None,
+    sheet: str = "",
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Same output as convert(), rebuilding only cards whose inputs or referenced ids changed since
+    `previous` (the last output) and `state` (its state file). Returns (output, new state, stats).
+    """
+    idx, labels_by_curie = load_ontology(jsonld_path)
+    columns, rows = load_csv_rows(csv_path, sheet)
+
+    hazard_nodes = {iri_to_curie(iri): (iri, node) for iri, node in idx.items() if is_hazard_individual(node)}
+    rows_by_id: Dict[str, List[Any]] = {}
+    id_pos = columns.index("Hazard ID")
+    for row in rows:
+        hazard_id = csv_row_hazard_id(row, id_pos)
+        if hazard_id:
+            rows_by_id.setdefault(hazard_id, []).append(row)
+
+    templates_digest = _digest(TEMPLATES_EN)
+    prev_entries: Dict[str, Any] = {}
+    if state and state.get("version") == STATE_VERSION and state.get("templates") == templates_digest:
+        prev_entries = state.get("cards") or {}
+    prev_cards = {c.get("id"): c for c in (previous or {}).get("hazards") or [] if isinstance(c, dict)}
+
+    ref_digests: Dict[str, str] = {}
+
+    def _ref_digest(ref: str) -> str:
+        if ref not in ref_digests:
+            ref_digests[ref] = reference_digest(ref, idx, labels_by_curie)
+        return ref_digests[ref]
+
+    cards: Dict[str, Dict[str, Any]] = {}
+    entries: Dict[str, Any] = {}
+    input_digests: Dict[str, str] = {}
+    changed_refs: Dict[str, int] = {}
+    stats = {"cards": 0, "reused": 0, "rebuilt_inputs": 0, "rebuilt_refs": 0, "removed": 0}
+
+    for hazard_id in unique_preserve(list(hazard_nodes) + list(rows_by_id)):
+        node = hazard_nodes.get(hazard_id, ("", None))[1]
+        input_digests[hazard_id] = _digest([node, [columns, rows_by_id.get(hazard_id, [])]])
+        prev = prev_entries.get(hazard_id)
+        if prev is None or hazard_id not in prev_cards or prev.get("input") != input_digests[hazard_id]:
+            stats["rebuilt_inputs"] += 1
+            continue
+        stale = [ref for ref, d in (prev.get("refs") or {}).items() if _ref_digest(ref) != d]
+        if stale:
+            stats["rebuilt_refs"] += 1
+            for ref in stale:
+                changed_refs[ref] = changed_refs.get(ref, 0) + 1
+            continue
+        cards[hazard_id] = prev_cards[hazard_id]
+        entries[hazard_id] = prev
+        stats["reused"] += 1
+
+    dirty = [h for h in input_digests if h not in cards]
+    if dirty:
+        rebuilt = extract_ontology_hazards(dict(hazard_nodes[h] for h in dirty if h in hazard_nodes), labels_by_curie)
+        rebuilt = merge_csv_rows_into_cards(rebuilt, columns, [r for h in dirty for r in rows_by_id.get(h, [])])
+        enrich_risk_assessment_from_ontology(rebuilt, idx, labels_by_curie)
+        finalize_verbalization(rebuilt, labels_by_curie)
+        for hazard_id, card in rebuilt.items():
+            cards[hazard_id] = card
+            entries[hazard_id] = {
+                "input": input_digests[hazard_id],
+                "refs": {ref: _ref_digest(ref) for ref in card_references(card)},
+            }
+
+    stats["cards"] = len(cards)
+    stats["removed"] = len(set(prev_entries) - set(cards))
+    # referenced ids whose label/node change forced a re-render, with the number of cards affected
+    stats["changed_refs"] = dict(sorted(changed_refs.items(), key=lambda kv: (-kv[1], kv[0])))
+    new_state = {"version": STATE_VERSION, "templates": templates_digest, "cards": entries}
+    return cards_document(jsonld_path, csv_path, cards, sheet), new_state, stats
+
+
+def _read_json_if_exists(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    return obj if isinstance(obj, dict) else None
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("jsonld", help="Path to JSON-LD file (hazard_ontology_v5.jsonld)")
-    ap.add_argument("csv", help="Path to hazards.csv")
+    ap.add_argument("csv", help="Path to hazards.csv or hazards.xlsx (read directly, streaming)")
     ap.add_argument("output", help="Path to output JSON file (hazard cards v5)")
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse unchanged cards from the existing output (per-card hashes in --state)",
+    )
+    ap.add_argument("--state", default="", help="Incremental state file (default: <output>.state.json)")
+    ap.add_argument("--sheet", default="", help="Worksheet name or 0-based index for .xlsx input (default: first sheet)")
     args = ap.parse_args()
 
-    out = convert(args.jsonld, args.csv)
+    if args.incremental:
+        state_path = args.state or args.output + ".state.json"
+        out, state, stats = convert_incremental(
+            args.jsonld,
+            args.csv,
+            previous=_read_json_if_exists(args.output),
+            state=_read_json_if_exists(state_path),
+            sheet=args.sheet,
+        )
+        print(
+            f"Incremental: {stats['reused']} reused, {stats['rebuilt_inputs']} rebuilt (content), "
+            f"{stats['rebuilt_refs']} rebuilt (referenced labels/nodes), {stats['removed']} removed"
+        )
+        for ref, n in list(stats["changed_refs"].items())[:10]:
+            print(f"  changed {ref}: {n} card(s)")
+    else:
+        out = convert(args.jsonld, args.csv, args.sheet)
 
     with open(args.output, "w", encoding="utf-8") as f:
         json.dump(out, f, ensure_ascii=False, indent=2)
 
+    # state last: it must never describe cards the output file does not hold
+    if args.incremental:
+        with open(state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+
     print(f"Wrote {len(out.get('hazards', []))} hazard cards to: {args.output}")
 
 
@@ -25,10 +25,13 @@ request.json schema (subset-compatible with your runner):
 {
   "question": "...",
   "llm": {"base_url":"http://localhost:1234/v1", "model":"...", "api_key":"...", "temperature":0.2, "max_tokens":4096},
+         # optional response cache: "cache_dir":"llm_cache", "cache_max_mb":1024, "cache_replay":false
   "retrieval": {
     "top_k": {"Memory": 30},         # optional; Memory-only
     "recent_k": {"Memory": 50},      # optional; Memory-only
     "per_doc_chars": 800,
+    "min_score": null,               # optional; drop BM25 hits scoring <= min_score (null: score 0 only)
+    "rel_score": 0.0,                # optional; drop BM25 hits < rel_score * best score
     "min_citations": 2              # metric only; no rewrite
   },
   "corpora": {
@@ -44,8 +47,12 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import re
+import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -69,14 +76,28 @@ DEFAULT_API_KEY = "lm-studio"
 DEFAULT_TEMPERATURE = 0.2
 DEFAULT_MAX_TOKENS = 8192
 
+# Optional on-disk LLM response cache (off unless llm.cache_dir / --llm_cache_dir is set).
+# replay: never call the server; a cache miss is an error (offline regression runs).
+DEFAULT_LLM_CACHE_DIR = ""
+DEFAULT_LLM_CACHE_MAX_MB = 1024
+DEFAULT_LLM_CACHE_REPLAY = False
+
 # memory-only retrieval defaults
 DEFAULT_TOP_K_MEMORY = 250
 DEFAULT_RECENT_K_MEMORY = 250
 DEFAULT_PER_DOC_CHARS = 10000
+# BM25 cutoffs after top-k selection: drop hits <= min_score or < rel_score * best score.
+# min_score None (default) drops only zero-score events (no weighted query term); BM25Okapi
+# scores matches in tiny memories negatively, so a 0.0 floor would drop them.
+DEFAULT_MIN_SCORE: Optional[float] = None
+DEFAULT_REL_SCORE = 0.0
 
 # metric only; no rewrite pass
 DEFAULT_MIN_CITATIONS = 2
 
+# rough chars/token ratio for the prompt_tokens_est metric (no tokenizer dependency)
+CHARS_PER_TOKEN_EST = 4
+
 SYSTEM_DEFAULT = (
     "You are a careful assistant. "
     "Follow output-format rules exactly."
@@ -223,21 +244,71 @@ def _doc_text(it: Item) -> str:
     return " ".join([p for p in parts if p])
 
 
+def select_top_k(
+    scores: np.ndarray,
+    top_k: int,
+    *,
+    min_score: Optional[float] = DEFAULT_MIN_SCORE,
+    rel_score: float = DEFAULT_REL_SCORE,
+) -> Tuple[np.ndarray, int]:
+    """
+    Indices of the top_k scores in descending order (partition + sort of k: O(n + k log k)),
+    minus hits below the score cutoffs. Ties go to the lower index, also at the k-th place, so
+    the order equals the first k of a stable argsort. Returns (indices, number of hits dropped
+    by the cutoffs).
+    """
+    n = int(scores.size)
+    k = min(int(top_k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), 0
+    if k < n:
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        part = np.concatenate([above, np.flatnonzero(scores == kth)[: k - above.size]])
+    else:
+        part = np.arange(n)
+    top = part[np.lexsort((part, -scores[part]))]
+    keep = scores[top] != 0 if min_score is None else scores[top] > min_score
+    best = float(scores[top[0]])
+    if rel_score > 0 and best > 0:
+        keep &= scores[top] >= rel_score * best
+    kept = top[keep]
+    return kept, k - int(kept.size)
+
+
 class BM25Index:
     def __init__(self, items: List[Item]):
         self.items = items
         self.docs_tokens = [_tokenize(_doc_text(it)) for it in items]
         self.bm25 = BM25Okapi(self.docs_tokens) if self.docs_tokens else None
 
-    def retrieve(self, query: str, top_k: int) -> List[Tuple[Item, float]]:
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        *,
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+    ) -> Tuple[List[Tuple[Item, float]], int]:
+        """retrieve() plus the number of top_k hits dropped by the score cutoffs."""
         if not self.items or self.bm25 is None:
-            return []
+            return [], 0
         q = _tokenize(query)
         if not q:
-            return []
-        scores = self.bm25.get_scores(q)
-        idx = np.argsort(scores)[::-1][:top_k]
-        return [(self.items[i], float(scores[i])) for i in idx]
+            return [], 0
+        scores = np.asarray(self.bm25.get_scores(q))
+        idx, dropped = select_top_k(scores, top_k, min_score=min_score, rel_score=rel_score)
+        return [(self.items[i], float(scores[i])) for i in idx], dropped
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int,
+        *,
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+    ) -> List[Tuple[Item, float]]:
+        return self.search(query, top_k, min_score=min_score, rel_score=rel_score)[0]
 
 
 def _truncate_context(text: str, limit: int, *, mode: str = "tail") -> str:
@@ -302,36 +373,188 @@ def build_memory_context(
         top_k: int,
         recent_k: int,
         per_doc_chars: int,
-) -> Tuple[str, Dict[str, str]]:
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+        timings: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, Dict[str, str], int]:
+    """
+    Returns (full context, {"Memory": block}, BM25 hits dropped by the score cutoffs).
+    `timings` receives index_build_sec, retrieval_sec and context_format_sec.
+    """
     if not memory_items:
-        return "", {"Memory": ""}
+        return "", {"Memory": ""}, 0
 
+    t0 = time.perf_counter()
     idx = BM25Index(memory_items)
+    if timings is not None:
+        timings["index_build_sec"] = round(time.perf_counter() - t0, 6)
+    t0 = time.perf_counter()
 
     hits: List[Tuple[Item, float]] = []
+    dropped = 0
     if top_k > 0:
-        hits.extend(idx.retrieve(query, top_k))
+        bm25_hits, dropped = idx.search(query, top_k, min_score=min_score, rel_score=rel_score)
+        hits.extend(bm25_hits)
 
     if recent_k > 0:
         recent_items = memory_items[-recent_k:]
         hits.extend([(it, -1.0) for it in reversed(recent_items)])
 
     hits = _dedupe_hits(hits)
+    if timings is not None:
+        timings["retrieval_sec"] = round(time.perf_counter() - t0, 6)
+    t0 = time.perf_counter()
     block = format_hits(hits, per_doc_chars=per_doc_chars)
     full = f"### Memory\n{block}".strip() if block.strip() else ""
-    return full, {"Memory": block}
+    if timings is not None:
+        timings["context_format_sec"] = round(time.perf_counter() - t0, 6)
+    return full, {"Memory": block}, dropped
 
 
 # =============================================================================
 # LLM client (ONE CALL ONLY)
 # =============================================================================
 
+def _normalize_prompt_text(text: str) -> str:
+    lines = (text or "").replace("\r\n", "\n").replace("\r", "\n").strip().split("\n")
+    return "\n".join(line.rstrip() for line in lines)
+
+
+class ResponseCache:
+    """
+    Content-addressed disk cache of chat completions: one JSON file per
+    sha256(model, system, user, temperature, max_tokens) over whitespace-normalized prompts.
+    Hits touch the file; once the directory exceeds max_bytes the least recently used
+    files (oldest mtime) are evicted; max_mb <= 0 leaves the directory unbounded.
+    With replay=True a miss raises instead of calling the LLM.
+    """
+
+    def __init__(self, root: str, *, max_mb: float = DEFAULT_LLM_CACHE_MAX_MB, replay: bool = DEFAULT_LLM_CACHE_REPLAY):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        max_bytes = int(float(max_mb) * 1024 * 1024)
+        self.max_bytes: Optional[int] = max_bytes if max_bytes > 0 else None
+        self.replay = bool(replay)
+
+    @staticmethod
+    def key(model: str, system: str, user: str, temperature: float, max_tokens: int, variant: str = "") -> str:
+        fields: Dict[str, Any] = {
+            "model": model,
+            "system": _normalize_prompt_text(system),
+            "user": _normalize_prompt_text(user),
+            "temperature": float(temperature),
+            "max_tokens": int(max_tokens),
+        }
+        if variant:
+            fields["variant"] = variant
+        blob = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        p = self._path(key)
+        try:
+            entry = json.loads(p.read_text(encoding="utf-8"))
+            os.utime(p)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and isinstance(entry.get("text"), str) else None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        fd, tmp = tempfile.mkstemp(prefix=f".{key[:16]}.", suffix=".tmp", dir=str(self.root))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        max_bytes = self.max_bytes
+        if max_bytes is None:
+            return
+        files = []
+        total = 0
+        with os.scandir(self.root) as it:
+            for e in it:
+                if e.name.endswith(".json") and e.is_file():
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime, st.st_size, e.path))
+                    total += st.st_size
+        if total <= max_bytes:
+            return
+        for _mtime, size, path in sorted(files):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= max_bytes:
+                break
+
+
+def response_cache_from_config(llm_cfg: Dict[str, Any]) -> Optional[ResponseCache]:
+    cache_dir = str(llm_cfg.get("cache_dir", DEFAULT_LLM_CACHE_DIR) or "")
+    if not cache_dir:
+        if llm_cfg.get("cache_replay"):
+            raise ValueError("llm.cache_replay requires llm.cache_dir")
+        return None
+    return ResponseCache(
+        cache_dir,
+        max_mb=float(llm_cfg.get("cache_max_mb", DEFAULT_LLM_CACHE_MAX_MB) or 0),
+        replay=bool(llm_cfg.get("cache_replay", DEFAULT_LLM_CACHE_REPLAY)),
+    )
+
+
+def cache_metrics(cache: Optional[ResponseCache], chat: Any) -> Dict[str, Any]:
+    status = getattr(chat, "last_cache", "off")
+    return {
+        "mode": ("off" if cache is None else ("replay" if cache.replay else "readwrite")),
+        "hits": int(status == "hit"),
+        "misses": int(status == "miss"),
+    }
+
+
 class LocalChat:
-    def __init__(self, base_url: str, model: str, api_key: str = DEFAULT_API_KEY):
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        api_key: str = DEFAULT_API_KEY,
+        *,
+        cache: Optional[ResponseCache] = None,
+    ):
         self.client = OpenAI(base_url=base_url, api_key=api_key)
         self.model = model
+        self.cache = cache
+        # response cache outcome of the last call: "hit" | "miss" | "off"
+        self.last_cache = "off"
+        # token accounting of the last call, as reported by the server (may be empty)
+        self.last_usage: Dict[str, Any] = {}
 
     def chat(self, system: str, user: str, temperature: float, max_tokens: int) -> str:
+        key = ""
+        if self.cache is not None:
+            key = ResponseCache.key(self.model, system, user, temperature, max_tokens)
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.last_cache = "hit"
+                self.last_usage = hit.get("usage") or {}
+                return hit["text"]
+            if self.cache.replay:
+                raise RuntimeError(f"LLM cache miss in replay mode (model={self.model}, key={key[:16]})")
+        self.last_cache = "miss" if key else "off"
+
         resp = self.client.chat.completions.create(
             model=self.model,
             messages=[
@@ -342,8 +565,17 @@ class LocalChat:
             max_tokens=max_tokens,
         )
         raw = resp.model_dump() if hasattr(resp, "model_dump") else json.loads(resp.json())
+        self.last_usage = (raw or {}).get("usage") or {}
         msg = (((raw or {}).get("choices") or [{}])[0].get("message") or {})
-        return (msg.get("content") or "").strip()
+        text = (msg.get("content") or "").strip()
+
+        if key:
+            self.cache.put(key, {"model": self.model, "text": text, "usage": self.last_usage})
+        return text
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN_EST - 1) // CHARS_PER_TOKEN_EST
 
 
 def count_inline_citations(text: str) -> int:
@@ -408,11 +640,17 @@ def run_llm_keywords_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
     recent_k = int((ret_cfg.get("recent_k") or {}).get("Memory", DEFAULT_RECENT_K_MEMORY))
     per_doc_chars = int(ret_cfg.get("per_doc_chars", DEFAULT_PER_DOC_CHARS))
     min_citations = int(ret_cfg.get("min_citations", DEFAULT_MIN_CITATIONS))
+    min_score = ret_cfg.get("min_score", DEFAULT_MIN_SCORE)
+    min_score = None if min_score is None else float(min_score)
+    rel_score = float(ret_cfg.get("rel_score", DEFAULT_REL_SCORE))
 
     corpora = req.get("corpora") or {}
     mem_src = corpora.get("Memory")  # optional
 
+    t_start = time.perf_counter()
+    timings: Dict[str, Any] = {}
     memory_items = load_memory_items(mem_src)
+    timings["load_sec"] = round(time.perf_counter() - t_start, 6)
 
     # Ensure stable 'nummer' + 'artikel' for citations
     for i, it in enumerate(memory_items, start=1):
@@ -421,12 +659,15 @@ def run_llm_keywords_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
         it.meta.setdefault("nummer", str(i))
         it.meta.setdefault("artikel", str(it.meta.get("artikel") or it.meta.get("meta") or "Memory"))
 
-    context_full, per = build_memory_context(
+    context_full, per, bm25_dropped = build_memory_context(
         memory_items,
         query=question,
         top_k=top_k,
         recent_k=recent_k,
         per_doc_chars=per_doc_chars,
+        min_score=min_score,
+        rel_score=rel_score,
+        timings=timings,
     )
 
     uses_retrieval = bool(context_full.strip())
@@ -434,20 +675,28 @@ def run_llm_keywords_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
     # -----------------------------
     # ONE AND ONLY LLM CALL
     # -----------------------------
-    chat = LocalChat(base_url=base_url, model=model, api_key=api_key)
+    llm_cache = response_cache_from_config(llm_cfg)
+    chat = LocalChat(base_url=base_url, model=model, api_key=api_key, cache=llm_cache)
+    prompt = PROMPT_LLM_KEYWORDS_ONE_SHOT.format(context=context_full, question=question)
+    t0 = time.perf_counter()
     final = chat.chat(
         SYSTEM_DEFAULT,
-        PROMPT_LLM_KEYWORDS_ONE_SHOT.format(context=context_full, question=question),
+        prompt,
         temperature=temperature,
         max_tokens=max_tokens,
     ).strip()
+    timings["llm_sec"] = round(time.perf_counter() - t0, 6)
 
+    t0 = time.perf_counter()
     c_count = count_inline_citations(final)
+    timings["parse_sec"] = round(time.perf_counter() - t0, 6)
+    timings["total_sec"] = round(time.perf_counter() - t_start, 6)
     return {
         "final": final,
         "contexts": {"pass1": per, "pass2": {}},
         "metrics": {
             "llm_calls": 1,
+            "llm_cache": cache_metrics(llm_cache, chat),
             "uses_retrieval": uses_retrieval,
             "retrieval_corpora": ["Memory"] if uses_retrieval else [],
             "citation_count": c_count,
@@ -455,8 +704,14 @@ def run_llm_keywords_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
             "has_min_citations": bool(c_count >= min_citations),
             "top_k_memory": top_k,
             "recent_k_memory": recent_k,
+            "bm25_dropped": bm25_dropped,
             "memory_items_loaded": len(memory_items),
             "output_mode": "keywords_only",
+            "context_chars": len(per.get("Memory", "")),
+            "prompt_tokens_est": _estimate_tokens(SYSTEM_DEFAULT) + _estimate_tokens(prompt),
+            "prompt_tokens": chat.last_usage.get("prompt_tokens"),
+            "completion_tokens": chat.last_usage.get("completion_tokens"),
+            "timings": timings,
         },
         "meta": {"mode": "llm_keywords_one_shot", "model": model, "base_url": base_url, "question": question},
     }
@@ -473,6 +728,9 @@ def main() -> int:
     ap.add_argument("--model", default="", help="Override model")
     ap.add_argument("--out", default="", help="Optional output JSON path")
     ap.add_argument("--out_md", default="", help="Optional output Markdown path")
+    ap.add_argument("--llm_cache_dir", default="", help="Directory of the on-disk LLM response cache (off if empty)")
+    ap.add_argument("--llm_cache_max_mb", type=float, default=0, help="Size bound of the response cache (LRU eviction; negative = unbounded)")
+    ap.add_argument("--llm_cache_replay", action="store_true", help="Answer only from the response cache; a miss is an error")
     args = ap.parse_args()
 
     req = json.loads(Path(args.input).read_text(encoding="utf-8"))
@@ -480,6 +738,12 @@ def main() -> int:
         req.setdefault("llm", {})["base_url"] = args.base_url
     if args.model:
         req.setdefault("llm", {})["model"] = args.model
+    if args.llm_cache_dir:
+        req.setdefault("llm", {})["cache_dir"] = args.llm_cache_dir
+    if args.llm_cache_max_mb:
+        req.setdefault("llm", {})["cache_max_mb"] = args.llm_cache_max_mb
+    if args.llm_cache_replay:
+        req.setdefault("llm", {})["cache_replay"] = True
 
     res = run_llm_keywords_one_shot(req)
 
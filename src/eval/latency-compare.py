@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+latency-compare.py (LATENCY REGRESSION CHECK BETWEEN TWO SCENARIO RUNS)
+
+Compares the per method × model latency stats of two runner output folders
+(<out_dir>/<timestamp>, written by simplerag-scenario-test-hazard.py or
+auto/autoscoring-scenario-test-hazard.py) and flags regressions.
+
+Inputs (per run folder):
+- latency_summary.json  (written by the runners)
+- summary.csv           (fallback for runs made before latency_summary.json existed; elapsed_sec
+                         and, when present, the t_llm_sec / completion_tokens columns)
+
+A stat regresses when it got worse by more than --threshold (relative) and, for the latency stats
+(not the throughput ones), by at least --min_delta_sec seconds. Exit code 1 if any regression is flagged (usable as a CI gate).
+
+Usage example:
+python3 latency-compare.py \
+  data/scenario_runs_compare/20260224T085316Z \
+  data/scenario_runs_compare/20260224T124304Z \
+  --threshold 0.10 --out latency_compare.csv
+
+Run folders can also be given as bare timestamps, resolved under --runs_dir.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# =============================================================================
+# Defaults
+# =============================================================================
+
+DEFAULT_RUNS_DIR = "data/scenario_runs_compare"
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MIN_DELTA_SEC = 0.05
+
+# compared stats -> True if higher is worse (latencies), False if lower is worse (throughput)
+COMPARE_STATS = {
+    "elapsed_p50_sec": True,
+    "elapsed_p95_sec": True,
+    "elapsed_p99_sec": True,
+    "elapsed_mean_sec": True,
+    "llm_p50_sec": True,
+    "llm_p95_sec": True,
+    "llm_ttft_p50_sec": True,
+    "completion_tokens_per_sec": False,
+    "cases_per_sec": False,
+}
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def _resolve_run_dir(spec: str, runs_dir: Path) -> Path:
+    p = Path(spec)
+    if p.is_dir():
+        return p
+    if (runs_dir / spec).is_dir():
+        return runs_dir / spec
+    raise FileNotFoundError(f"run folder not found: {spec} (also tried {runs_dir / spec})")
+
+
+def _percentile(xs: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile (same method as the runners' latency summary)."""
+    if not xs:
+        return None
+    s = sorted(xs)
+    pos = (len(s) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(s) - 1)
+    return round(s[lo] + (s[hi] - s[lo]) * (pos - lo), 6)
+
+
+def _groups_from_summary_csv(path: Path) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Compared stats per (method, model) from summary.csv rows (ok runs only)."""
+    rows: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for r in csv.DictReader(f):
+            if str(r.get("ok", "")).strip().lower() not in ("true", "1"):
+                continue
+            rows.setdefault((r.get("method", ""), r.get("model", "")), []).append(r)
+
+    def _vals(rs: List[Dict[str, str]], col: str) -> List[float]:
+        return [float(r[col]) for r in rs if (r.get(col) or "").strip()]
+
+    out: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for key, rs in rows.items():
+        elapsed = _vals(rs, "elapsed_sec")
+        llm = _vals(rs, "t_llm_sec")
+        ttft = _vals(rs, "t_llm_ttft_sec")
+        total = sum(elapsed)
+        timed = [r for r in rs if (r.get("completion_tokens") or "").strip() and (r.get("t_llm_sec") or "").strip()]
+        llm_total = sum(float(r["t_llm_sec"]) for r in timed)
+        out[key] = {
+            "n_ok": len(rs),
+            "elapsed_p50_sec": _percentile(elapsed, 50),
+            "elapsed_p95_sec": _percentile(elapsed, 95),
+            "elapsed_p99_sec": _percentile(elapsed, 99),
+            "elapsed_mean_sec": round(total / len(elapsed), 6) if elapsed else None,
+            "llm_p50_sec": _percentile(llm, 50),
+            "llm_p95_sec": _percentile(llm, 95),
+            "llm_ttft_p50_sec": _percentile(ttft, 50),
+            "completion_tokens_per_sec": (
+                round(sum(float(r["completion_tokens"]) for r in timed) / llm_total, 3) if llm_total > 0 else None
+            ),
+            "cases_per_sec": round(len(elapsed) / total, 4) if total > 0 else None,
+        }
+    return out
+
+
+def load_latency_groups(run_dir: Path) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], str]:
+    """(method, model) -> stats, plus the file they came from."""
+    js = run_dir / "latency_summary.json"
+    if js.exists():
+        obj = json.loads(js.read_text(encoding="utf-8"))
+        return {(str(g.get("method", "")), str(g.get("model", ""))): g for g in obj.get("groups") or []}, js.name
+    sc = run_dir / "summary.csv"
+    if sc.exists():
+        return _groups_from_summary_csv(sc), sc.name
+    raise FileNotFoundError(f"{run_dir}: neither latency_summary.json nor summary.csv found")
+
+
+# =============================================================================
+# Compare
+# =============================================================================
+
+def compare_runs(
+    base: Dict[Tuple[str, str], Dict[str, Any]],
+    new: Dict[Tuple[str, str], Dict[str, Any]],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_sec: float = DEFAULT_MIN_DELTA_SEC,
+) -> List[Dict[str, Any]]:
+    """One row per (method, model, stat) present in both runs, with `regression` set when flagged."""
+    out: List[Dict[str, Any]] = []
+    for key in sorted(set(base) & set(new)):
+        b, n = base[key], new[key]
+        for stat, higher_is_worse in COMPARE_STATS.items():
+            bv, nv = b.get(stat), n.get(stat)
+            if bv is None or nv is None:
+                continue
+            bv, nv = float(bv), float(nv)
+            delta = nv - bv
+            rel = (delta / bv) if bv else None
+            worse = delta if higher_is_worse else -delta
+            regression = bool(
+                rel is not None
+                and worse / bv > threshold
+                and (not higher_is_worse or worse >= min_delta_sec)
+            )
+            out.append({
+                "method": key[0],
+                "model": key[1],
+                "stat": stat,
+                "base": bv,
+                "new": nv,
+                "delta": round(delta, 6),
+                "rel_change": None if rel is None else round(rel, 4),
+                "base_n_ok": b.get("n_ok"),
+                "new_n_ok": n.get("n_ok"),
+                "regression": regression,
+            })
+    return out
+
+
+def _print_table(rows: List[Dict[str, Any]]) -> None:
+    head = f"{'method':<12} {'model':<20} {'stat':<26} {'base':>11} {'new':>11} {'change':>8}"
+    print(head)
+    print("-" * len(head))
+    for r in rows:
+        rel = "" if r["rel_change"] is None else f"{r['rel_change'] * 100:+.1f}%"
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(
+            f"{r['method']:<12} {r['model'][:20]:<20} {r['stat']:<26} "
+            f"{r['base']:>11.4g} {r['new']:>11.4g} {rel:>8}{flag}"
+        )
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Flag latency regressions between two scenario run folders.")
+    ap.add_argument("base", help="Baseline run folder (<out_dir>/<timestamp>) or timestamp under --runs_dir")
+    ap.add_argument("new", help="Run folder to check against the baseline")
+    ap.add_argument("--runs_dir", default=DEFAULT_RUNS_DIR, help="Where bare timestamps are resolved")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative worsening that counts as a regression")
+    ap.add_argument("--min_delta_sec", type=float, default=DEFAULT_MIN_DELTA_SEC, help="Ignore latency changes smaller than this (seconds)")
+    ap.add_argument("--out", default="", help="Optional CSV with all compared stats")
+    args = ap.parse_args()
+
+    runs_dir = Path(args.runs_dir)
+    base_dir = _resolve_run_dir(args.base, runs_dir)
+    new_dir = _resolve_run_dir(args.new, runs_dir)
+    base, base_src = load_latency_groups(base_dir)
+    new, new_src = load_latency_groups(new_dir)
+
+    print(f"base: {base_dir} ({base_src})")
+    print(f"new:  {new_dir} ({new_src})")
+    for label, only in (("base", set(base) - set(new)), ("new", set(new) - set(base))):
+        for method, model in sorted(only):
+            print(f"[warn] {method}/{model} only in {label} run; not compared")
+
+    rows = compare_runs(base, new, threshold=args.threshold, min_delta_sec=args.min_delta_sec)
+    print("")
+    _print_table(rows)
+
+    if args.out:
+        out = Path(args.out)
+        with out.open("w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["method", "model", "stat"], quoting=csv.QUOTE_ALL)
+            w.writeheader()
+            w.writerows(rows)
+        print(f"\nWrote: {out}")
+
+    n_reg = sum(r["regression"] for r in rows)
+    print(f"\n{n_reg} regression(s) (threshold {args.threshold:.0%}, min delta {args.min_delta_sec} s)")
+    return 1 if n_reg else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
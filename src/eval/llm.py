@@ -23,10 +23,16 @@ request.json schema (subset-compatible with srcot.py):
 {
   "question": "...",
   "llm": {"base_url":"http://localhost:1234/v1", "model":"...", "api_key":"...", "temperature":0.2, "max_tokens":4096},
+         # optional response cache: "cache_dir":"llm_cache", "cache_max_mb":1024, "cache_replay":false
   "retrieval": {
     "top_k": {"Memory": 30},         # optional; Memory-only
     "recent_k": {"Memory": 50},      # optional; Memory-only
     "per_doc_chars": 800,
+    "min_score": null,               # optional; drop BM25 hits scoring <= min_score (null: score 0 only)
+    "rel_score": 0.0,                # optional; drop BM25 hits < rel_score * best score
+    "recent_window_sec": 900,        # optional; recency block = last 15 min by time_key (realT|simT)
+    "time_decay_half_life_sec": 0,   # optional; blend exponential recency into BM25 (time_decay_weight)
+    "memory_granularity": "event",   # optional; "incident" = one digest per einsatzNr
     "min_citations": 2              # metric only; no rewrite
   },
   "corpora": {
@@ -42,11 +48,21 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import bisect
+import hashlib
 import json
+import math
+import os
 import re
-from dataclasses import dataclass
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 from rank_bm25 import BM25Okapi
@@ -67,14 +83,49 @@ DEFAULT_API_KEY = "lm-studio"
 DEFAULT_TEMPERATURE = 0.2
 DEFAULT_MAX_TOKENS = 131072
 
+# Optional on-disk LLM response cache (off unless llm.cache_dir / --llm_cache_dir is set).
+# replay: never call the server; a cache miss is an error (offline regression runs).
+DEFAULT_LLM_CACHE_DIR = ""
+DEFAULT_LLM_CACHE_MAX_MB = 1024
+DEFAULT_LLM_CACHE_REPLAY = False
+
 # memory-only retrieval defaults
 DEFAULT_TOP_K_MEMORY = 250
 DEFAULT_RECENT_K_MEMORY = 250
 DEFAULT_PER_DOC_CHARS = 10000
+# BM25 cutoffs after top-k selection: drop hits <= min_score or < rel_score * best score.
+# min_score None (default) drops only zero-score events (no weighted query term); BM25Okapi
+# scores matches in tiny memories negatively, so a 0.0 floor would drop them.
+DEFAULT_MIN_SCORE: Optional[float] = None
+DEFAULT_REL_SCORE = 0.0
+
+# Time-bounded Memory (off by default): events are kept sorted by retrieval.time_key.
+# recent_window_sec > 0 replaces the last-recent_k events by the events of the last N seconds
+# (recent_k still caps the count); time_decay_half_life_sec > 0 blends an exponential recency
+# factor into the BM25 scores: score * ((1 - w) + w * 0.5 ** (age / half_life)).
+# realT is epoch milliseconds; simT is assumed to use the same unit (time_units_per_sec).
+MEMORY_TIME_KEYS = ("realT", "simT")
+DEFAULT_TIME_KEY = "realT"
+DEFAULT_TIME_UNITS_PER_SEC = 1000.0
+DEFAULT_RECENT_WINDOW_SEC = 0.0
+DEFAULT_TIME_DECAY_HALF_LIFE_SEC = 0.0
+DEFAULT_TIME_DECAY_WEIGHT = 0.5
+
+# "incident": retrieve and render Memory per einsatzNr (one digest per incident, scored by its
+# best event) instead of one block per event.
+MEMORY_GRANULARITIES = ("event", "incident")
+DEFAULT_MEMORY_GRANULARITY = "event"
+INCIDENT_MAX_VEHICLES = 8
+
+# Memory indexes kept by MemoryIndexPool (in-process runners); least recently used first out.
+DEFAULT_MEMORY_POOL_MAX = 64
 
 # metric only; no rewrite pass
 DEFAULT_MIN_CITATIONS = 2
 
+# rough chars/token ratio for the prompt_tokens_est metric (no tokenizer dependency)
+CHARS_PER_TOKEN_EST = 4
+
 SYSTEM_DEFAULT = (
     "You are a careful assistant. "
     "Use ONLY the provided CONTEXT as data. "
@@ -122,6 +173,20 @@ QUESTION:
 class Item:
     content: str
     meta: Dict[str, Any]
+    # top-level snapshot fields next to content/meta (eventId, einsatzNr, realT, simT, vehicle
+    # fields); read by the timeline, incident grouping and citations, never part of the BM25 text
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+
+def _item_field(it: Item, *keys: str) -> Any:
+    """First non-empty value of `keys`, looked up in meta before the snapshot fields."""
+    meta = it.meta if isinstance(it.meta, dict) else {}
+    for k in keys:
+        for src in (meta, it.fields):
+            v = src.get(k)
+            if v not in (None, ""):
+                return v
+    return None
 
 
 # =============================================================================
@@ -179,7 +244,9 @@ def load_items(path_or_inline: Any) -> List[Item]:
         if isinstance(content, str) and content.strip():
             if not isinstance(meta, dict):
                 meta = {"meta": meta}
-            out.append(Item(content=content.strip(), meta=meta))
+            # memory snapshots carry eventId/einsatzNr/realT/simT/vehicle fields next to content
+            fields = {k: v for k, v in it.items() if k not in ("content", "meta")}
+            out.append(Item(content=content.strip(), meta=meta, fields=fields))
     return out
 
 
@@ -203,19 +270,236 @@ def _doc_text(it: Item) -> str:
     return " ".join([p for p in parts if p])
 
 
+def _event_time(it: Item, time_key: str) -> float:
+    v = _item_field(it, time_key)
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class MemoryTimeline:
+    """
+    Memory events as time-sorted columns: `times` (ascending) and `order` (item index of each
+    time). Appends in time order are O(1); late events are placed with bisect. Events without
+    a timestamp are kept out of the columns (never in a window, never decayed).
+    """
+
+    def __init__(self, items: Iterable[Item] = (), *, time_key: str = DEFAULT_TIME_KEY):
+        self.time_key = time_key
+        self.times = array("d")
+        self.order = array("q")
+        self._item_times = array("d")  # per item index, NaN if missing
+        self.append(items)
+
+    def append(self, items: Iterable[Item]) -> None:
+        for it in items:
+            i = len(self._item_times)
+            t = _event_time(it, self.time_key)
+            self._item_times.append(t)
+            if math.isnan(t):
+                continue
+            if not self.times or t >= self.times[-1]:
+                self.times.append(t)
+                self.order.append(i)
+            else:
+                pos = bisect.bisect_right(self.times, t)
+                self.times.insert(pos, t)
+                self.order.insert(pos, i)
+
+    def latest(self) -> Optional[float]:
+        return self.times[-1] if self.times else None
+
+    def window(self, span: float, *, end: Optional[float] = None) -> List[int]:
+        """Item indices with end - span < time <= end (end defaults to the latest event), newest first."""
+        if end is None:
+            end = self.latest()
+        if end is None:
+            return []
+        lo = bisect.bisect_right(self.times, end - span)
+        hi = bisect.bisect_right(self.times, end)
+        return list(reversed(self.order[lo:hi]))
+
+    def decay(self, half_life: float, *, now: Optional[float] = None) -> np.ndarray:
+        """0.5 ** (age / half_life) per item index; 1.0 for undated and future events."""
+        t = np.frombuffer(self._item_times, dtype=np.float64)
+        if now is None:
+            now = self.latest()
+        if now is None or half_life <= 0:
+            return np.ones(t.size)
+        age = np.clip(now - t, 0.0, None)
+        return np.where(np.isnan(age), 1.0, np.power(0.5, age / half_life))
+
+
+def select_top_k(
+    scores: np.ndarray,
+    top_k: int,
+    *,
+    min_score: Optional[float] = DEFAULT_MIN_SCORE,
+    rel_score: float = DEFAULT_REL_SCORE,
+) -> Tuple[np.ndarray, int]:
+    """
+    Indices of the top_k scores in descending order (partition + sort of k: O(n + k log k)),
+    minus hits below the score cutoffs. Ties go to the lower index, also at the k-th place, so
+    the order equals the first k of a stable argsort. Returns (indices, number of hits dropped
+    by the cutoffs).
+    """
+    n = int(scores.size)
+    k = min(int(top_k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), 0
+    if k < n:
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        part = np.concatenate([above, np.flatnonzero(scores == kth)[: k - above.size]])
+    else:
+        part = np.arange(n)
+    top = part[np.lexsort((part, -scores[part]))]
+    keep = scores[top] != 0 if min_score is None else scores[top] > min_score
+    best = float(scores[top[0]])
+    if rel_score > 0 and best > 0:
+        keep &= scores[top] >= rel_score * best
+    kept = top[keep]
+    return kept, k - int(kept.size)
+
+
 class BM25Index:
-    def __init__(self, items: List[Item]):
-        self.items = items
-        self.docs_tokens = [_tokenize(_doc_text(it)) for it in items]
-        self.bm25 = BM25Okapi(self.docs_tokens)
+    """
+    Append-only BM25 over Memory events. Scores equal rank_bm25.BM25Okapi on the same documents
+    (k1, b and the epsilon floor for negative idf included). append() extends the postings,
+    document frequencies and length totals in place, so a long-lived caller can ingest events as
+    they arrive and query at any moment without a rebuild. `timeline` keeps the same events
+    sorted by `time_key` for windowed recency and time decay.
+    """
 
-    def retrieve(self, query: str, top_k: int) -> List[Tuple[Item, float]]:
+    def __init__(
+        self,
+        items: Iterable[Item] = (),
+        *,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+        time_key: str = DEFAULT_TIME_KEY,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.items: List[Item] = []
+        self.vocab: Dict[str, int] = {}
+        self._df = array("q")  # documents per term id
+        self._postings: List[Tuple[array, array]] = []  # term id -> (doc ids, term frequencies)
+        self._doc_len = array("q")
+        self._total_len = 0
+        # average idf runs over the whole vocabulary; recomputed on the first query after append()
+        self._average_idf: Optional[float] = None
+        self.timeline = MemoryTimeline(time_key=time_key)
+        self._lock = threading.RLock()
+        self.append(items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def append(self, items: Iterable[Item]) -> int:
+        """Indexes `items` as the next documents; returns how many were added."""
+        items = list(items)
+        added = 0
+        with self._lock:
+            self.timeline.append(items)
+            for it in items:
+                doc_id = len(self.items)
+                tokens = _tokenize(_doc_text(it))
+                freqs: Dict[str, int] = {}
+                for t in tokens:
+                    freqs[t] = freqs.get(t, 0) + 1
+                for t, tf in freqs.items():
+                    j = self.vocab.get(t)
+                    if j is None:
+                        j = self.vocab[t] = len(self._postings)
+                        self._postings.append((array("q"), array("q")))
+                        self._df.append(0)
+                    ids, tfs = self._postings[j]
+                    ids.append(doc_id)
+                    tfs.append(tf)
+                    self._df[j] += 1
+                self._doc_len.append(len(tokens))
+                self._total_len += len(tokens)
+                self.items.append(it)
+                added += 1
+            if added:
+                self._average_idf = None
+        return added
+
+    def _idf(self, j: int) -> float:
+        n = len(self.items)
+        if self._average_idf is None:
+            df = np.frombuffer(self._df, dtype=np.int64).astype(np.float64)
+            self._average_idf = float(np.mean(np.log(n - df + 0.5) - np.log(df + 0.5))) if df.size else 0.0
+        df_j = self._df[j]
+        idf = math.log(n - df_j + 0.5) - math.log(df_j + 0.5)
+        return self.epsilon * self._average_idf if idf < 0 else idf
+
+    def get_scores(self, q_tokens: List[str]) -> np.ndarray:
+        """Same scores as BM25Okapi.get_scores (repeated query tokens count repeatedly)."""
+        with self._lock:
+            n = len(self.items)
+            scores = np.zeros(n)
+            if not n or not self._total_len:
+                return scores
+            avgdl = self._total_len / n
+            doc_len = np.frombuffer(self._doc_len, dtype=np.int64)
+            for t in q_tokens:
+                j = self.vocab.get(t)
+                if j is None:
+                    continue
+                ids = np.frombuffer(self._postings[j][0], dtype=np.int64)
+                tf = np.frombuffer(self._postings[j][1], dtype=np.int64).astype(np.float64)
+                scores[ids] += self._idf(j) * (
+                    tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * doc_len[ids] / avgdl))
+                )
+            return scores
+
+    def query_scores(
+        self, query: str, *, half_life: float = 0.0, decay_weight: float = DEFAULT_TIME_DECAY_WEIGHT
+    ) -> Optional[np.ndarray]:
+        """Scores of every event for `query` (time decay blended in); None if it has no tokens."""
         q = _tokenize(query)
         if not q:
-            return []
-        scores = self.bm25.get_scores(q)
-        idx = np.argsort(scores)[::-1][:top_k]
-        return [(self.items[i], float(scores[i])) for i in idx]
+            return None
+        with self._lock:
+            scores = self.get_scores(q)
+            if half_life > 0:
+                scores *= (1.0 - decay_weight) + decay_weight * self.timeline.decay(half_life)
+        return scores
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        *,
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+        half_life: float = 0.0,
+        decay_weight: float = DEFAULT_TIME_DECAY_WEIGHT,
+    ) -> Tuple[List[Tuple[Item, float]], int]:
+        """
+        retrieve() plus the number of top_k hits dropped by the score cutoffs. half_life > 0
+        (in time_key units) blends the timeline decay into the scores before selection.
+        """
+        scores = self.query_scores(query, half_life=half_life, decay_weight=decay_weight)
+        if scores is None:
+            return [], 0
+        idx, dropped = select_top_k(scores, top_k, min_score=min_score, rel_score=rel_score)
+        return [(self.items[i], float(scores[i])) for i in idx], dropped
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int,
+        *,
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+    ) -> List[Tuple[Item, float]]:
+        return self.search(query, top_k, min_score=min_score, rel_score=rel_score)[0]
 
 
 def _truncate_context(text: str, limit: int, *, mode: str = "tail") -> str:
@@ -244,8 +528,8 @@ def format_hits(hits: List[Tuple[Item, float]], per_doc_chars: int = 800) -> str
         nummer = meta.get("nummer", "?")
         spez = meta.get("spezifikation") or meta.get("artikel") or ""
 
-        einsatz_nr = meta.get("einsatzNr") or meta.get("einsatznr") or meta.get("incidentNr") or meta.get("incident") or ""
-        event_id = meta.get("eventId") or meta.get("event_id") or ""
+        einsatz_nr = _item_field(it, "einsatzNr", "einsatznr", "incidentNr", "incident") or ""
+        event_id = _item_field(it, "eventId", "event_id") or ""
         incident_tag = f"#{einsatz_nr}" if einsatz_nr else (f"evt:{event_id}" if event_id else "")
 
         cite_parts = [f"Memory:{nummer}"]
@@ -275,6 +559,171 @@ def _dedupe_hits(hits: List[Tuple[Item, float]]) -> List[Tuple[Item, float]]:
     return out
 
 
+# =============================================================================
+# Incident aggregation (Memory grouped by einsatzNr)
+# =============================================================================
+
+def _incident_key(it: Item) -> str:
+    einsatz_nr = _item_field(it, "einsatzNr", "einsatznr", "incidentNr", "incident")
+    if einsatz_nr:
+        return f"#{einsatz_nr}"
+    return f"evt:{_item_field(it, 'eventId', 'event_id', 'nummer') or id(it)}"
+
+
+def _format_event_time(v: Any) -> str:
+    try:
+        return datetime.fromtimestamp(float(v) / 1000.0, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%SZ")
+    except (TypeError, ValueError, OverflowError, OSError):
+        return ""
+
+
+def _compress_numbers(numbers: List[str]) -> str:
+    """"3, 4, 5, 9" -> "3-5, 9" for runs of consecutive integer Memory numbers."""
+    parts: List[str] = []
+    run: List[int] = []
+    for n in numbers + [""]:
+        if n.isdigit() and run and int(n) == run[-1] + 1:
+            run.append(int(n))
+            continue
+        if run:
+            parts.append(f"{run[0]}-{run[-1]}" if len(run) > 1 else str(run[0]))
+            run = []
+        if n.isdigit():
+            run = [int(n)]
+        elif n:
+            parts.append(n)
+    return ", ".join(parts)
+
+
+class IncidentIndex:
+    """
+    Event positions grouped by incident (einsatzNr; events without one stay single). Incident
+    scores are the best event score, so the event BM25Index (and its time decay) is reused.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self.keys: List[str] = []
+        self.members: List[List[int]] = []
+        self._of_event = array("q")
+        self._by_key: Dict[str, int] = {}
+        self.append(items)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def append(self, items: Iterable[Item]) -> None:
+        for it in items:
+            key = _incident_key(it)
+            j = self._by_key.get(key)
+            if j is None:
+                j = self._by_key[key] = len(self.keys)
+                self.keys.append(key)
+                self.members.append([])
+            self.members[j].append(len(self._of_event))
+            self._of_event.append(j)
+
+    def of_event(self, i: int) -> int:
+        return self._of_event[i]
+
+    def scores(self, event_scores: np.ndarray) -> np.ndarray:
+        out = np.full(len(self.keys), -np.inf)
+        np.maximum.at(out, np.frombuffer(self._of_event, dtype=np.int64)[: event_scores.size], event_scores)
+        return out
+
+    def digest(
+        self, j: int, items: List[Item], *, time_key: str = DEFAULT_TIME_KEY, best: Optional[int] = None
+    ) -> Item:
+        """
+        One Item per incident: first/last event, vehicles, the best-matching event (`best`) and
+        the latest content. It carries the latest event's meta and snapshot fields, so format_hits
+        cites it as [Memory:N #einsatz]; the other events are listed by their Memory numbers.
+        """
+        times = {i: _event_time(items[i], time_key) for i in self.members[j]}
+        events = sorted(self.members[j], key=lambda i: (math.isnan(times[i]), 0.0 if math.isnan(times[i]) else times[i], i))
+        first, last = items[events[0]], items[events[-1]]
+        vehicles: List[str] = []
+        for i in events:
+            name = str(_item_field(items[i], "callsign", "vehicleId") or "").strip()
+            vehicle_type = _item_field(items[i], "vehicleType")
+            if vehicle_type:
+                name = f"{name} ({vehicle_type})" if name else str(vehicle_type)
+            if name and name not in vehicles:
+                vehicles.append(name)
+        span = " – ".join(dict.fromkeys(t for t in (_format_event_time(_item_field(first, "realT")), _format_event_time(_item_field(last, "realT"))) if t))
+        numbers = _compress_numbers([str(items[i].meta.get("nummer", "?")) for i in events])
+        lines = [f"Incident {self.keys[j]}: {len(events)} event(s) (Memory:{numbers}){f', {span}' if span else ''}"]
+        if vehicles:
+            more = f" (+{len(vehicles) - INCIDENT_MAX_VEHICLES} more)" if len(vehicles) > INCIDENT_MAX_VEHICLES else ""
+            lines.append("Vehicles: " + ", ".join(vehicles[:INCIDENT_MAX_VEHICLES]) + more)
+        if len(events) > 1:
+            lines.append(f"First: {first.content}")
+        if best is not None and best not in (events[0], events[-1]):
+            lines.append(f"Match (Memory:{items[best].meta.get('nummer', '?')}): {items[best].content}")
+        lines.append(f"Latest: {last.content}")
+        return Item(content="\n".join(lines), meta=dict(last.meta or {}), fields=dict(last.fields))
+
+
+# (resolved memory path, time_key)
+_MemoryPoolKey = Tuple[str, str]
+
+
+class MemoryIndexPool:
+    """
+    Long-lived Memory indexes for callers that answer many requests in one process (the
+    scenario runners' --in_process mode). Keyed by memory file and time_key; every lookup gets
+    the freshly loaded items of the file. If the indexed events are an unchanged prefix of
+    them, only the new events are appended (BM25Index and IncidentIndex are append-only);
+    otherwise the index is rebuilt. At most max_entries files are kept (least recently used
+    evicted). Lookups of one file are serialized by a per-key lock, other files proceed;
+    requests sharing a file retrieve over every event indexed so far.
+    """
+
+    def __init__(self, *, max_entries: int = DEFAULT_MEMORY_POOL_MAX):
+        if int(max_entries) < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries!r}")
+        self.max_entries = int(max_entries)
+        self._lock = threading.Lock()  # guards _entries and _key_locks; never held while indexing
+        self._entries: OrderedDict[_MemoryPoolKey, Tuple[BM25Index, IncidentIndex]] = OrderedDict()
+        self._key_locks: Dict[_MemoryPoolKey, threading.Lock] = {}
+
+    def get(
+        self, path: str, items: List[Item], *, time_key: str = DEFAULT_TIME_KEY
+    ) -> Tuple[BM25Index, IncidentIndex, str]:
+        """
+        (index, incidents, status) over `items`; status is "warm" (nothing new), "appended" or
+        "built". The index's own item list (idx.items) is the one to retrieve from.
+        """
+        key = (str(Path(path).resolve()), time_key)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+            if entry is not None:
+                idx, incidents = entry
+                n = len(idx)
+                if n <= len(items) and idx.items == items[:n]:
+                    if n == len(items):
+                        return idx, incidents, "warm"
+                    new = items[n:]
+                    idx.append(new)
+                    incidents.append(new)
+                    return idx, incidents, "appended"
+            idx = BM25Index(items, time_key=time_key)
+            incidents = IncidentIndex(items)
+            with self._lock:
+                self._entries[key] = (idx, incidents)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    old, _entry = self._entries.popitem(last=False)
+                    lock = self._key_locks.get(old)
+                    if lock is not None and not lock.locked():
+                        del self._key_locks[old]
+            return idx, incidents, "built"
+
+
 def build_memory_context(
         memory_items: List[Item],
         query: str,
@@ -282,52 +731,316 @@ def build_memory_context(
         top_k: int,
         recent_k: int,
         per_doc_chars: int,
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+        index: Optional[BM25Index] = None,
+        time_key: str = DEFAULT_TIME_KEY,
+        time_units_per_sec: float = DEFAULT_TIME_UNITS_PER_SEC,
+        recent_window_sec: float = DEFAULT_RECENT_WINDOW_SEC,
+        time_decay_half_life_sec: float = DEFAULT_TIME_DECAY_HALF_LIFE_SEC,
+        time_decay_weight: float = DEFAULT_TIME_DECAY_WEIGHT,
+        granularity: str = DEFAULT_MEMORY_GRANULARITY,
+        incidents: Optional[IncidentIndex] = None,
+        timings: Optional[Dict[str, Any]] = None,
 ) -> Tuple[str, Dict[str, str], Dict[str, int]]:
     """
     Returns:
       - full context (markdown)
       - per-corpus blocks ({"Memory": ...})
       - retrieval stats
+
+    `index` is a live BM25Index over exactly `memory_items` (appended as events arrive);
+    without it the index is built from `memory_items` for this call. With recent_window_sec > 0
+    the recency block holds the events of that window before the latest event (by time_key),
+    newest first and capped at recent_k (if > 0), instead of the last recent_k items in file order.
+
+    granularity "incident" ranks incidents (einsatzNr) by their best event and renders one
+    digest per incident; top_k then counts incidents and recent events pull in their incident.
+
+    `timings` receives retrieval_sec and context_format_sec (incident digests count as retrieval).
     """
-    idx = BM25Index(memory_items)
+    t0 = time.perf_counter()
+    idx = index if index is not None else BM25Index(memory_items, time_key=time_key)
+    if granularity == "incident":
+        res = _build_incident_context(
+            memory_items,
+            query,
+            idx=idx,
+            incidents=incidents if incidents is not None else IncidentIndex(memory_items),
+            top_k=top_k,
+            recent_k=recent_k,
+            per_doc_chars=per_doc_chars,
+            min_score=min_score,
+            rel_score=rel_score,
+            time_key=time_key,
+            time_units_per_sec=time_units_per_sec,
+            recent_window_sec=recent_window_sec,
+            time_decay_half_life_sec=time_decay_half_life_sec,
+            time_decay_weight=time_decay_weight,
+        )
+        if timings is not None:
+            timings["retrieval_sec"] = round(time.perf_counter() - t0, 6)
+            timings["context_format_sec"] = 0.0
+        return res
 
     hits: List[Tuple[Item, float]] = []
     bm25_count = 0
+    bm25_dropped = 0
     recent_count = 0
 
     if top_k > 0:
-        bm25_hits = idx.retrieve(query, top_k)
+        bm25_hits, bm25_dropped = idx.search(
+            query,
+            top_k,
+            min_score=min_score,
+            rel_score=rel_score,
+            half_life=time_decay_half_life_sec * time_units_per_sec,
+            decay_weight=time_decay_weight,
+        )
         bm25_count = len(bm25_hits)
         hits.extend(bm25_hits)
 
-    if recent_k > 0:
+    if recent_window_sec > 0:
+        window = idx.timeline.window(recent_window_sec * time_units_per_sec)
+        recent_items = [memory_items[i] for i in (window[:recent_k] if recent_k > 0 else window)]
+        recent_count = len(recent_items)
+        hits.extend([(it, -1.0) for it in recent_items])
+    elif recent_k > 0:
         recent_items = memory_items[-recent_k:]
         recent_count = len(recent_items)
         hits.extend([(it, -1.0) for it in reversed(recent_items)])
 
     hits = _dedupe_hits(hits)
+    if timings is not None:
+        timings["retrieval_sec"] = round(time.perf_counter() - t0, 6)
+    t0 = time.perf_counter()
 
     block = format_hits(hits, per_doc_chars=per_doc_chars)
     full = f"### Memory\n{block}".strip() if block.strip() else ""
+    if timings is not None:
+        timings["context_format_sec"] = round(time.perf_counter() - t0, 6)
     stats = {
         "memory_items_total": len(memory_items),
         "bm25_hits": bm25_count,
+        "bm25_dropped": bm25_dropped,
         "recent_added": recent_count,
         "deduped_hits": len(hits),
     }
     return full, {"Memory": block}, stats
 
 
+def _build_incident_context(
+        memory_items: List[Item],
+        query: str,
+        *,
+        idx: BM25Index,
+        incidents: IncidentIndex,
+        top_k: int,
+        recent_k: int,
+        per_doc_chars: int,
+        min_score: Optional[float],
+        rel_score: float,
+        time_key: str,
+        time_units_per_sec: float,
+        recent_window_sec: float,
+        time_decay_half_life_sec: float,
+        time_decay_weight: float,
+) -> Tuple[str, Dict[str, str], Dict[str, int]]:
+    order: List[int] = []
+    bm25_count = 0
+    bm25_dropped = 0
+    recent_count = 0
+    scores: Optional[np.ndarray] = None
+
+    if top_k > 0:
+        scores = idx.query_scores(
+            query, half_life=time_decay_half_life_sec * time_units_per_sec, decay_weight=time_decay_weight
+        )
+        if scores is not None:
+            top, bm25_dropped = select_top_k(incidents.scores(scores), top_k, min_score=min_score, rel_score=rel_score)
+            order.extend(int(j) for j in top)
+            bm25_count = len(order)
+
+    if recent_window_sec > 0:
+        window = idx.timeline.window(recent_window_sec * time_units_per_sec)
+        recent = window[:recent_k] if recent_k > 0 else window
+    else:
+        recent = list(range(len(memory_items) - 1, max(len(memory_items) - recent_k, 0) - 1, -1)) if recent_k > 0 else []
+    recent_incidents = list(dict.fromkeys(incidents.of_event(i) for i in recent))
+    recent_count = len(recent_incidents)
+    order.extend(recent_incidents)
+    order = list(dict.fromkeys(order))
+
+    hits = [
+        (
+            incidents.digest(
+                j,
+                memory_items,
+                time_key=time_key,
+                best=max(incidents.members[j], key=lambda i: scores[i]) if scores is not None else None,
+            ),
+            0.0,
+        )
+        for j in order
+    ]
+    block = format_hits(hits, per_doc_chars=per_doc_chars)
+    full = f"### Memory\n{block}".strip() if block.strip() else ""
+    stats = {
+        "memory_items_total": len(memory_items),
+        "incidents_total": len(incidents),
+        "bm25_hits": bm25_count,
+        "bm25_dropped": bm25_dropped,
+        "recent_added": recent_count,
+        "deduped_hits": len(hits),
+        "incident_events": sum(len(incidents.members[j]) for j in order),
+    }
+    return full, {"Memory": block}, stats
+
+
 # =============================================================================
 # LLM client (ONE CALL ONLY)
 # =============================================================================
 
+def _normalize_prompt_text(text: str) -> str:
+    lines = (text or "").replace("\r\n", "\n").replace("\r", "\n").strip().split("\n")
+    return "\n".join(line.rstrip() for line in lines)
+
+
+class ResponseCache:
+    """
+    Content-addressed disk cache of chat completions: one JSON file per
+    sha256(model, system, user, temperature, max_tokens) over whitespace-normalized prompts.
+    Hits touch the file; once the directory exceeds max_bytes the least recently used
+    files (oldest mtime) are evicted; max_mb <= 0 leaves the directory unbounded.
+    With replay=True a miss raises instead of calling the LLM.
+    """
+
+    def __init__(self, root: str, *, max_mb: float = DEFAULT_LLM_CACHE_MAX_MB, replay: bool = DEFAULT_LLM_CACHE_REPLAY):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        max_bytes = int(float(max_mb) * 1024 * 1024)
+        self.max_bytes: Optional[int] = max_bytes if max_bytes > 0 else None
+        self.replay = bool(replay)
+
+    @staticmethod
+    def key(model: str, system: str, user: str, temperature: float, max_tokens: int, variant: str = "") -> str:
+        fields: Dict[str, Any] = {
+            "model": model,
+            "system": _normalize_prompt_text(system),
+            "user": _normalize_prompt_text(user),
+            "temperature": float(temperature),
+            "max_tokens": int(max_tokens),
+        }
+        if variant:
+            fields["variant"] = variant
+        blob = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        p = self._path(key)
+        try:
+            entry = json.loads(p.read_text(encoding="utf-8"))
+            os.utime(p)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and isinstance(entry.get("text"), str) else None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        fd, tmp = tempfile.mkstemp(prefix=f".{key[:16]}.", suffix=".tmp", dir=str(self.root))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        max_bytes = self.max_bytes
+        if max_bytes is None:
+            return
+        files = []
+        total = 0
+        with os.scandir(self.root) as it:
+            for e in it:
+                if e.name.endswith(".json") and e.is_file():
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime, st.st_size, e.path))
+                    total += st.st_size
+        if total <= max_bytes:
+            return
+        for _mtime, size, path in sorted(files):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= max_bytes:
+                break
+
+
+def response_cache_from_config(llm_cfg: Dict[str, Any]) -> Optional[ResponseCache]:
+    cache_dir = str(llm_cfg.get("cache_dir", DEFAULT_LLM_CACHE_DIR) or "")
+    if not cache_dir:
+        if llm_cfg.get("cache_replay"):
+            raise ValueError("llm.cache_replay requires llm.cache_dir")
+        return None
+    return ResponseCache(
+        cache_dir,
+        max_mb=float(llm_cfg.get("cache_max_mb", DEFAULT_LLM_CACHE_MAX_MB) or 0),
+        replay=bool(llm_cfg.get("cache_replay", DEFAULT_LLM_CACHE_REPLAY)),
+    )
+
+
+def cache_metrics(cache: Optional[ResponseCache], chat: Any) -> Dict[str, Any]:
+    status = getattr(chat, "last_cache", "off")
+    return {
+        "mode": ("off" if cache is None else ("replay" if cache.replay else "readwrite")),
+        "hits": int(status == "hit"),
+        "misses": int(status == "miss"),
+    }
+
+
 class LocalChat:
-    def __init__(self, base_url: str, model: str, api_key: str = DEFAULT_API_KEY):
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        api_key: str = DEFAULT_API_KEY,
+        *,
+        cache: Optional[ResponseCache] = None,
+    ):
         self.client = OpenAI(base_url=base_url, api_key=api_key)
         self.model = model
+        self.cache = cache
+        # response cache outcome of the last call: "hit" | "miss" | "off"
+        self.last_cache = "off"
+        # token accounting of the last call, as reported by the server (may be empty)
+        self.last_usage: Dict[str, Any] = {}
 
     def chat(self, system: str, user: str, temperature: float, max_tokens: int) -> str:
+        key = ""
+        if self.cache is not None:
+            key = ResponseCache.key(self.model, system, user, temperature, max_tokens)
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.last_cache = "hit"
+                self.last_usage = hit.get("usage") or {}
+                return hit["text"]
+            if self.cache.replay:
+                raise RuntimeError(f"LLM cache miss in replay mode (model={self.model}, key={key[:16]})")
+        self.last_cache = "miss" if key else "off"
+
         resp = self.client.chat.completions.create(
             model=self.model,
             messages=[
@@ -341,8 +1054,17 @@ class LocalChat:
             raw = resp.model_dump()
         else:
             raw = json.loads(resp.json())
+        self.last_usage = (raw or {}).get("usage") or {}
         msg = (((raw or {}).get("choices") or [{}])[0].get("message") or {})
-        return (msg.get("content") or "").strip()
+        text = (msg.get("content") or "").strip()
+
+        if key:
+            self.cache.put(key, {"model": self.model, "text": text, "usage": self.last_usage})
+        return text
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN_EST - 1) // CHARS_PER_TOKEN_EST
 
 
 def count_inline_citations(text: str) -> int:
@@ -391,7 +1113,11 @@ def render_markdown(res: Dict[str, Any]) -> str:
 # Runner
 # =============================================================================
 
-def run_llm_memory_rag_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
+def run_llm_memory_rag_one_shot(req: Dict[str, Any], *, pool: Optional[MemoryIndexPool] = None) -> Dict[str, Any]:
+    """
+    One Memory-RAG answer. With `pool` (long-lived callers), a file-backed Memory corpus is
+    indexed once and later requests only append the events added to the file since.
+    """
     question = str(req.get("question", "") or "").strip()
     if not question:
         raise ValueError("request.question is required")
@@ -408,6 +1134,19 @@ def run_llm_memory_rag_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
     recent_k = int((ret_cfg.get("recent_k") or {}).get("Memory", DEFAULT_RECENT_K_MEMORY))
     per_doc_chars = int(ret_cfg.get("per_doc_chars", DEFAULT_PER_DOC_CHARS))
     min_citations = int(ret_cfg.get("min_citations", DEFAULT_MIN_CITATIONS))
+    min_score = ret_cfg.get("min_score", DEFAULT_MIN_SCORE)
+    min_score = None if min_score is None else float(min_score)
+    time_key = str(ret_cfg.get("time_key", DEFAULT_TIME_KEY))
+    if time_key not in MEMORY_TIME_KEYS:
+        raise ValueError(f"retrieval.time_key must be one of {MEMORY_TIME_KEYS}, got {time_key!r}")
+    time_units_per_sec = float(ret_cfg.get("time_units_per_sec", DEFAULT_TIME_UNITS_PER_SEC))
+    recent_window_sec = float(ret_cfg.get("recent_window_sec", DEFAULT_RECENT_WINDOW_SEC))
+    half_life_sec = float(ret_cfg.get("time_decay_half_life_sec", DEFAULT_TIME_DECAY_HALF_LIFE_SEC))
+    decay_weight = float(ret_cfg.get("time_decay_weight", DEFAULT_TIME_DECAY_WEIGHT))
+    granularity = str(ret_cfg.get("memory_granularity", DEFAULT_MEMORY_GRANULARITY))
+    if granularity not in MEMORY_GRANULARITIES:
+        raise ValueError(f"retrieval.memory_granularity must be one of {MEMORY_GRANULARITIES}, got {granularity!r}")
+    rel_score = float(ret_cfg.get("rel_score", DEFAULT_REL_SCORE))
 
     corpora = req.get("corpora") or {}
     mem_src = corpora.get("Memory")
@@ -416,8 +1155,11 @@ def run_llm_memory_rag_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
     memory_items: List[Item] = []
     memory_enabled = False
 
+    t_start = time.perf_counter()
+    timings: Dict[str, Any] = {}
     if mem_src is not None:
         memory_items = load_items(mem_src)
+    timings["load_sec"] = round(time.perf_counter() - t_start, 6)
 
     if memory_items:
         memory_enabled = True
@@ -428,12 +1170,31 @@ def run_llm_memory_rag_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
             it.meta.setdefault("nummer", str(i))
             it.meta.setdefault("artikel", str(it.meta.get("meta", "") or "Memory"))
 
+        t0 = time.perf_counter()
+        incidents: Optional[IncidentIndex] = None
+        if pool is not None and isinstance(mem_src, str):
+            index, incidents, _status = pool.get(mem_src, memory_items, time_key=time_key)
+            memory_items = index.items
+        else:
+            index = BM25Index(memory_items, time_key=time_key)
+        timings["index_build_sec"] = round(time.perf_counter() - t0, 6)
         context_full, per, rstats = build_memory_context(
             memory_items,
             query=question,
             top_k=top_k,
             recent_k=recent_k,
             per_doc_chars=per_doc_chars,
+            min_score=min_score,
+            rel_score=rel_score,
+            time_key=time_key,
+            time_units_per_sec=time_units_per_sec,
+            recent_window_sec=recent_window_sec,
+            time_decay_half_life_sec=half_life_sec,
+            time_decay_weight=decay_weight,
+            granularity=granularity,
+            index=index,
+            incidents=incidents,
+            timings=timings,
         )
         prompt = PROMPT_LLM_MEMORY_RAG_ONE_SHOT.format(context=context_full, question=question)
     else:
@@ -442,6 +1203,7 @@ def run_llm_memory_rag_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
         rstats = {
             "memory_items_total": 0,
             "bm25_hits": 0,
+            "bm25_dropped": 0,
             "recent_added": 0,
             "deduped_hits": 0,
         }
@@ -450,20 +1212,27 @@ def run_llm_memory_rag_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
     # -----------------------------
     # ONE AND ONLY LLM CALL
     # -----------------------------
-    chat = LocalChat(base_url=base_url, model=model, api_key=api_key)
+    llm_cache = response_cache_from_config(llm_cfg)
+    chat = LocalChat(base_url=base_url, model=model, api_key=api_key, cache=llm_cache)
+    t0 = time.perf_counter()
     final = chat.chat(
         SYSTEM_DEFAULT,
         prompt,
         temperature=temperature,
         max_tokens=max_tokens,
     ).strip()
+    timings["llm_sec"] = round(time.perf_counter() - t0, 6)
 
+    t0 = time.perf_counter()
     c_count = count_inline_citations(final)
+    timings["parse_sec"] = round(time.perf_counter() - t0, 6)
+    timings["total_sec"] = round(time.perf_counter() - t_start, 6)
     return {
         "final": final,
         "contexts": {"pass1": per, "pass2": {}},
         "metrics": {
             "llm_calls": 1,
+            "llm_cache": cache_metrics(llm_cache, chat),
             "uses_retrieval": bool(memory_enabled),
             "retrieval_corpora": (["Memory"] if memory_enabled else []),
             "memory_enabled": bool(memory_enabled),
@@ -472,7 +1241,15 @@ def run_llm_memory_rag_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
             "has_min_citations": bool(c_count >= min_citations) if memory_enabled else False,
             "top_k_memory": top_k if memory_enabled else 0,
             "recent_k_memory": recent_k if memory_enabled else 0,
+            "recent_window_sec": recent_window_sec if memory_enabled else 0,
+            "time_decay_half_life_sec": half_life_sec if memory_enabled else 0,
+            "memory_granularity": granularity,
             **rstats,
+            "context_chars": len(per.get("Memory", "")),
+            "prompt_tokens_est": _estimate_tokens(SYSTEM_DEFAULT) + _estimate_tokens(prompt),
+            "prompt_tokens": chat.last_usage.get("prompt_tokens"),
+            "completion_tokens": chat.last_usage.get("completion_tokens"),
+            "timings": timings,
         },
         "meta": {
             "mode": ("llm_memory_rag_one_shot" if memory_enabled else "llm_one_shot_no_memory"),
@@ -483,19 +1260,115 @@ def run_llm_memory_rag_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# =============================================================================
+# Benchmark (incremental Memory index)
+# =============================================================================
+
+_BENCH_UNITS = [("FL M 2/46/{n}", "FW_HLF"), ("RTW {n}", "RD_RTW"), ("ILS", "DISPATCH"), ("POL {n}", "POL_FUSTW")]
+_BENCH_TEXTS = [
+    "Heavy smoke from the cable duct, firefighting in progress; danger from hazardous gases, Status {s}.",
+    "Citywide power outage. Mobile network unstable, traffic lights down at junction {n}.",
+    "Water level rising at gauge {n}, basement flooding reported, pumps requested, Status {s}.",
+    "Patient transport after fall at site {n}; road blocked by debris, Status {s}.",
+    "Gas odour reported near substation {n}; area cordoned off, evacuation of block {s} ongoing.",
+]
+_BENCH_QUERIES = [
+    "power outage traffic lights mobile network",
+    "hazardous gases smoke cable duct",
+    "basement flooding water level gauge pumps",
+    "evacuation gas odour substation",
+]
+
+
+def _bench_events(start: int, count: int) -> List[Item]:
+    """
+    Deterministic synthetic dispatch events (site and gauge numbers add about 10k terms).
+    Snapshot keys go to `fields` as in load_items(), so they stay out of the BM25 text.
+    """
+    out: List[Item] = []
+    for i in range(start, start + count):
+        unit, vehicle_type = _BENCH_UNITS[i % len(_BENCH_UNITS)]
+        text = _BENCH_TEXTS[(i * 7) % len(_BENCH_TEXTS)].format(n=i % 9973, s=i % 9)
+        fields = {
+            "eventId": f"evt_{i:07d}",
+            "einsatzNr": f"{i // 25:06d}",
+            "realT": 1769410000000 + i * 1000,
+            "vehicleType": vehicle_type,
+        }
+        out.append(Item(content=f"{unit.format(n=i % 97)}: {text}", meta={"meta": "On scene"}, fields=fields))
+    return out
+
+
+def bench_memory_index(sizes: List[int], *, batch: int = 1000, queries: int = 200) -> List[Dict[str, Any]]:
+    """
+    Ingest throughput (append() in batches of `batch` events) and query latency of BM25Index at
+    each size, against a from-scratch BM25Okapi rebuild (skipped above 100k events).
+    """
+    rows: List[Dict[str, Any]] = []
+    idx = BM25Index()
+    ingest_sec = 0.0
+    for size in sorted(sizes):
+        while len(idx) < size:
+            events = _bench_events(len(idx), min(batch, size - len(idx)))
+            t0 = time.perf_counter()
+            idx.append(events)
+            ingest_sec += time.perf_counter() - t0
+
+        lat: List[float] = []
+        for i in range(queries):
+            q = _tokenize(_BENCH_QUERIES[i % len(_BENCH_QUERIES)])
+            t0 = time.perf_counter()
+            select_top_k(idx.get_scores(q), DEFAULT_TOP_K_MEMORY)
+            lat.append((time.perf_counter() - t0) * 1000.0)
+        row: Dict[str, Any] = {
+            "events": len(idx),
+            "vocab": len(idx.vocab),
+            "ingest_sec": round(ingest_sec, 3),
+            "ingest_events_per_sec": round(len(idx) / ingest_sec) if ingest_sec else None,
+            "query_ms_p50": round(float(np.percentile(lat, 50)), 3),
+            "query_ms_p95": round(float(np.percentile(lat, 95)), 3),
+            "rebuild_sec": None,
+            "rebuild_query_ms": None,
+            "max_abs_score_diff": None,
+        }
+        if size <= 100_000:
+            t0 = time.perf_counter()
+            ref = BM25Okapi([_tokenize(_doc_text(it)) for it in idx.items])
+            row["rebuild_sec"] = round(time.perf_counter() - t0, 3)
+            q = _tokenize(_BENCH_QUERIES[0])
+            t0 = time.perf_counter()
+            ref_scores = ref.get_scores(q)
+            row["rebuild_query_ms"] = round((time.perf_counter() - t0) * 1000.0, 3)
+            row["max_abs_score_diff"] = float(np.max(np.abs(ref_scores - idx.get_scores(q))))
+        rows.append(row)
+    return rows
+
+
 # =============================================================================
 # CLI
 # =============================================================================
 
 def main() -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--input", required=True, help="Path to request.json")
+    ap.add_argument("--input", default="", help="Path to request.json")
     ap.add_argument("--base_url", default="", help="Override base_url")
     ap.add_argument("--model", default="", help="Override model")
     ap.add_argument("--out", default="", help="Optional output JSON path")
     ap.add_argument("--out_md", default="", help="Optional output Markdown path")
+    ap.add_argument("--llm_cache_dir", default="", help="Directory of the on-disk LLM response cache (off if empty)")
+    ap.add_argument("--llm_cache_max_mb", type=float, default=0, help="Size bound of the response cache (LRU eviction; negative = unbounded)")
+    ap.add_argument("--llm_cache_replay", action="store_true", help="Answer only from the response cache; a miss is an error")
+    ap.add_argument("--bench_memory", default="", help="Benchmark the incremental Memory index at these event counts (e.g. 10000,100000,1000000) and exit")
     args = ap.parse_args()
 
+    if args.bench_memory:
+        sizes = [int(x) for x in args.bench_memory.split(",") if x.strip()]
+        for row in bench_memory_index(sizes):
+            print(json.dumps(row, ensure_ascii=False))
+        return 0
+    if not args.input:
+        ap.error("--input is required (unless --bench_memory)")
+
     req_raw = _safe_read_json(Path(args.input))
     if req_raw is None or not isinstance(req_raw, dict):
         raise ValueError(f"Could not read request.json: {args.input}")
@@ -506,6 +1379,12 @@ def main() -> int:
         req.setdefault("llm", {})["base_url"] = args.base_url
     if args.model:
         req.setdefault("llm", {})["model"] = args.model
+    if args.llm_cache_dir:
+        req.setdefault("llm", {})["cache_dir"] = args.llm_cache_dir
+    if args.llm_cache_max_mb:
+        req.setdefault("llm", {})["cache_max_mb"] = args.llm_cache_max_mb
+    if args.llm_cache_replay:
+        req.setdefault("llm", {})["cache_replay"] = True
 
     res = run_llm_memory_rag_one_shot(req)
 
@@ -8,21 +8,38 @@ Goal:
   verbalized_en, sample data, sources, etc.)
 - Optionally include Memory (einsatz logs) as auxiliary context (indicator-heavy matching).
 - Exactly ONE LLM call.
+- BM25 indexes of file-backed corpora are cached on disk next to the corpus
+  (<corpus>.<name>.<key>.bm25cache, key = content hash + analyzer fingerprint);
+  disable with --no_index_cache or retrieval.index_cache=false.
+- --serve keeps a warm process: corpora/indexes are loaded once (optionally preloaded from
+  --input) and request.json payloads are POSTed to /classify over HTTP or a Unix socket.
 
 Deps:
-  pip install openai rank-bm25 numpy
+  pip install openai rank-bm25 numpy scipy
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import inspect
 import json
+import os
+import pickle
 import re
-from dataclasses import dataclass
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Collection, Dict, List, Optional, Tuple
 
 import numpy as np
+import scipy.sparse as sp
 from rank_bm25 import BM25Okapi
 
 try:
@@ -40,12 +57,61 @@ DEFAULT_MODEL = "gpt-oss-120b"
 DEFAULT_API_KEY = "lm-studio"
 DEFAULT_TEMPERATURE = 0.2
 DEFAULT_MAX_TOKENS = 131072
+# Streaming: optionally cancel generation once the Direct Answer JSON (with hazard_id) is complete
+DEFAULT_STREAM = False
+DEFAULT_STOP_AFTER_ANSWER = False
 
 # For hazard classification, we usually want Knowledge-heavy retrieval.
 DEFAULT_TOP_K = {"Knowledge": 250, "Memory": 6, "Experiences": 0, "Environment": 0, "OpsState": 0}
 DEFAULT_RECENT_K = {"Memory": 10, "Environment": 0, "OpsState": 0, "Knowledge": 0, "Experiences": 0}
 DEFAULT_PER_DOC_CHARS = 1600
 DEFAULT_MIN_CITATIONS = 1
+# Score cutoffs applied after top-k selection: hits scoring <= min_score or < rel_score * best
+# score are dropped. min_score None (default) drops only zero-score hits, which share no
+# weighted term with the query (tiny corpora can score matches negatively, see BM25Okapi idf).
+# A min_score below every score (e.g. -1e9) keeps a fixed top_k as in the paper runs.
+DEFAULT_MIN_SCORE: Optional[float] = None
+DEFAULT_REL_SCORE = 0.0
+
+# Adaptive top_k (off by default): cut each corpus' BM25 hits at the knee of the sorted score
+# curve or where the cumulative score mass reaches adaptive_mass, within [min_k, max_k]
+# (max_k 0 = the corpus top_k, which always bounds the candidate curve).
+ADAPTIVE_K_MODES = ("off", "knee", "mass")
+DEFAULT_ADAPTIVE_K = "off"
+DEFAULT_ADAPTIVE_MIN_K = 5
+DEFAULT_ADAPTIVE_MAX_K = 0
+DEFAULT_ADAPTIVE_MASS = 0.8
+
+# Prompt token budget for the whole user prompt (0 = off: fixed top_k x per_doc_chars).
+# Packing uses a chars/token estimate; measured counts come from the server's `usage`.
+DEFAULT_TOKEN_BUDGET = 0
+CHARS_PER_TOKEN_EST = 4
+
+# BM25 query: "snippet" retrieves with the SNIPPET: text (or the question minus the testcase
+# template lines); "full" retrieves with the whole question as in the paper runs.
+QUERY_MODES = ("snippet", "full")
+DEFAULT_QUERY_MODE = "snippet"
+
+# Alias fast path (off by default): answer without the LLM when the snippet contains aliases of
+# exactly one hazard and that hazard leads BM25 by a relative margin (s1 - s2) / s1.
+DEFAULT_FAST_PATH = False
+DEFAULT_FAST_PATH_MARGIN = 0.25
+FAST_PATH_MIN_ALIAS_CHARS = 4  # shorter aliases (e.g. "AMR", "5G") match too much noise
+
+# Optional on-disk LLM response cache (off unless llm.cache_dir / --llm_cache_dir is set).
+# replay: never call the server; a cache miss is an error (offline regression runs).
+DEFAULT_LLM_CACHE_DIR = ""
+DEFAULT_LLM_CACHE_MAX_MB = 1024
+DEFAULT_LLM_CACHE_REPLAY = False
+
+# On-disk BM25 index cache (stored next to each file-backed corpus).
+# Bump INDEX_CACHE_VERSION whenever the pickled payload layout changes.
+DEFAULT_INDEX_CACHE = True
+INDEX_CACHE_VERSION = 4
+INDEX_CACHE_SUFFIX = ".bm25cache"
+
+# Warm indexes kept by IndexPool (server mode, in-process runners); least recently used first out.
+DEFAULT_INDEX_POOL_MAX = 16
 
 SYSTEM_DEFAULT = (
     "You are a careful assistant. "
@@ -79,6 +145,46 @@ SNIPPET:
 """
 
 
+# Prefix-stable layout for server-side prompt/KV caching: everything that does not depend on
+# the snippet (instructions + a deterministic hazard catalogue) comes first, the per-query
+# retrieved delta and the snippet last.
+PROMPT_HAZARD_CLASSIFY_CACHEABLE = """\
+You are performing retrieval-conditioned hazard labeling.
+
+Task:
+- Pick exactly ONE best-matching hazard card (Top-1) for the given snippet.
+- Output MUST be valid JSON in the 'Direct Answer' section (one line).
+- Use ONLY the HAZARD CATALOGUE and RETRIEVED CONTEXT as evidence.
+- If the best hazard is unclear, still pick the best candidate and lower confidence.
+
+Output format (Markdown):
+1) Direct Answer
+   - JSON (one line), schema:
+     {{"hazard_id":"...","label":"...","confidence":0.0,"evidence":["[Knowledge:.. ...]","..."],"notes":"short"}}
+2) Justification (2-6 bullet points, each with citations)
+
+HAZARD CATALOGUE:
+{catalogue}
+
+RETRIEVED CONTEXT (for this snippet):
+{context}
+
+SNIPPET:
+{snippet}
+"""
+
+# Hazard-card renderings: "full" indexes/prompts every field (incl. BM25_TEXT_EN, VERBALIZED_EN,
+# raw LINKS and RAW_JSON_TAIL, which repeat the same facts); "compact" renders each fact once.
+CARD_PROFILES = ("full", "compact")
+DEFAULT_CARD_PROFILE = "full"   # prompt view
+DEFAULT_INDEX_PROFILE = "full"  # BM25 view
+
+PROMPT_LAYOUTS = ("default", "cacheable")
+CATALOGUE_MODES = ("digest", "cards")
+DEFAULT_PROMPT_LAYOUT = "default"
+DEFAULT_CATALOGUE = "digest"
+
+
 # =============================================================================
 # Data model
 # =============================================================================
@@ -87,6 +193,10 @@ SNIPPET:
 class Item:
     content: str
     meta: Dict[str, Any]
+    # BM25 view when it differs from the prompt view (see CARD_PROFILES); "" = index content
+    index_text: str = ""
+    # exact-match surface forms (labels, altLabel, keywords; EN + DE) for the alias fast path
+    aliases: Tuple[str, ...] = ()
 
 
 # =============================================================================
@@ -216,13 +326,45 @@ def _labels_to_label(card: Dict[str, Any]) -> str:
     return str(v2).strip() if isinstance(v2, str) and str(v2).strip() else "not specified"
 
 
-def hazard_card_to_item(card: Dict[str, Any], idx: int) -> Item:
+def _split_aliases(values: List[str]) -> List[str]:
+    """altLabel/keywords entries are comma/semicolon separated lists in one string."""
+    out: List[str] = []
+    seen = set()
+    for v in values:
+        for a in re.split(r"[,;]", v):
+            a = " ".join(a.split())
+            if a and a.lower() not in seen:
+                out.append(a)
+                seen.add(a.lower())
+    return out
+
+
+# verbalized_en lines that only repeat altLabel / sources / sampleData (converter templates)
+_VERBALIZED_REPEAT_PREFIXES = ("Keywords:", "Schlüsselwörter:", "Sources:", "Sample data:")
+
+
+def hazard_card_to_item(
+    card: Dict[str, Any],
+    idx: int,
+    *,
+    profile: str = DEFAULT_CARD_PROFILE,
+    index_profile: str = DEFAULT_INDEX_PROFILE,
+) -> Item:
     """
     Convert one hazard card (hazard_cards_v5.json style) into an Item for BM25 indexing.
 
     Goal: index *all* useful fields (labels, altLabels, links, sources, sampleData, risk/assessment,
     verbalizations, bm25_text_en, etc.) so that indicator-heavy snippets can match robustly.
+
+    profile selects the prompt view (Item.content), index_profile the BM25 view:
+      - full:    every field, incl. BM25_TEXT_EN + VERBALIZED_EN (same sentences), raw LINKS CURIEs
+                 and a 4000-char RAW_JSON_TAIL of the card
+      - compact: each fact once: ids/labels, DESCRIPTION, ALIASES, relation sentences from
+                 verbalized_en, verbalized RISK, SOURCES, SAMPLE_DATA
     """
+    for prof in (profile, index_profile):
+        if prof not in CARD_PROFILES:
+            raise ValueError(f"unknown card profile: {prof!r} (expected one of {CARD_PROFILES})")
 
     def _get_label(card_obj: Dict[str, Any]) -> str:
         labels = card_obj.get("labels")
@@ -293,52 +435,96 @@ def hazard_card_to_item(card: Dict[str, Any], idx: int) -> Item:
 
     links = card.get("links") or {}
     risk = card.get("risk") or {}
+    description = card.get("description") or ""
 
-    parts: List[str] = []
-    parts.append(f"HAZARD_ID: {hazard_id}")
-    parts.append(f"LABEL: {label}")
-
-    if group:
-        parts.append(f"GROUP: {_stringify(group)}")
-    if subtype:
-        parts.append(f"SUBTYPE: {_stringify(subtype)}")
-
-    if alt_list:
-        parts.append("ALIASES: " + "; ".join([a for a in alt_list if a][:120]))
-
-    if isinstance(bm25_text, str) and bm25_text.strip():
-        parts.append("BM25_TEXT_EN: " + bm25_text.strip())
-
-    vlist = _as_list(verbalized)
-    if vlist:
-        parts.append("VERBALIZED_EN: " + " ".join(vlist))
-
-    if links:
-        lflat = _flatten_strings(links, max_items=160)
-        if lflat:
-            parts.append("LINKS: " + " ".join(lflat))
-
-    if risk:
-        rflat = _flatten_strings(risk, max_items=200)
-        if rflat:
-            parts.append("RISK: " + " ".join(rflat))
-
-    ssrc = _flatten_strings(sources, max_items=120)
-    if ssrc:
-        parts.append("SOURCES: " + " ".join(ssrc))
-
-    ssamp = _flatten_strings(sample, max_items=240)
-    if ssamp:
-        parts.append("SAMPLE_DATA: " + " ".join(ssamp))
-
-    # Compact JSON tail (capped) for schema drift
-    try:
-        tail = json.dumps(card, ensure_ascii=False)
-        if len(tail) > 4000:
-            tail = tail[:4000] + "…"
-        parts.append("RAW_JSON_TAIL: " + tail)
-    except Exception:
-        pass
+    def _render_full() -> str:
+        parts: List[str] = []
+        parts.append(f"HAZARD_ID: {hazard_id}")
+        parts.append(f"LABEL: {label}")
+
+        if group:
+            parts.append(f"GROUP: {_stringify(group)}")
+        if subtype:
+            parts.append(f"SUBTYPE: {_stringify(subtype)}")
+
+        if alt_list:
+            parts.append("ALIASES: " + "; ".join([a for a in alt_list if a][:120]))
+
+        if isinstance(bm25_text, str) and bm25_text.strip():
+            parts.append("BM25_TEXT_EN: " + bm25_text.strip())
+
+        vlist = _as_list(verbalized)
+        if vlist:
+            parts.append("VERBALIZED_EN: " + " ".join(vlist))
+
+        if links:
+            lflat = _flatten_strings(links, max_items=160)
+            if lflat:
+                parts.append("LINKS: " + " ".join(lflat))
+
+        if risk:
+            rflat = _flatten_strings(risk, max_items=200)
+            if rflat:
+                parts.append("RISK: " + " ".join(rflat))
+
+        ssrc = _flatten_strings(sources, max_items=120)
+        if ssrc:
+            parts.append("SOURCES: " + " ".join(ssrc))
+
+        ssamp = _flatten_strings(sample, max_items=240)
+        if ssamp:
+            parts.append("SAMPLE_DATA: " + " ".join(ssamp))
+
+        # Compact JSON tail (capped) for schema drift
+        try:
+            tail = json.dumps(card, ensure_ascii=False)
+            if len(tail) > 4000:
+                tail = tail[:4000] + "…"
+            parts.append("RAW_JSON_TAIL: " + tail)
+        except Exception:
+            pass
+        return "\n".join(parts).strip()
+
+    def _render_compact() -> str:
+        parts: List[str] = [f"HAZARD_ID: {hazard_id}", f"LABEL: {label}"]
+        if group:
+            parts.append(f"GROUP: {_stringify(group)}")
+        if subtype:
+            parts.append(f"SUBTYPE: {_stringify(subtype)}")
+        if isinstance(description, str) and description.strip():
+            parts.append("DESCRIPTION: " + description.strip())
+        if alt_list:
+            parts.append("ALIASES: " + "; ".join([a for a in alt_list if a][:120]))
+
+        # relation sentences carry the labels of linked ids; fall back to raw ids if not verbalized
+        relations = [v for v in _as_list(verbalized) if not v.startswith(_VERBALIZED_REPEAT_PREFIXES)]
+        if relations:
+            parts.append("RELATIONS: " + " ".join(relations))
+        elif links:
+            lflat = _flatten_strings(links, max_items=160)
+            if lflat:
+                parts.append("LINKS: " + " ".join(lflat))
+
+        if isinstance(risk, dict) and risk:
+            rverb = _as_list(risk.get("verbalized_en"))
+            assessment = risk.get("assessment")
+            if isinstance(assessment, dict):
+                rverb += _as_list(assessment.get("verbalized_en"))
+            rtxt = " ".join(rverb) or " ".join(_flatten_strings(risk, max_items=200))
+            if rtxt:
+                parts.append("RISK: " + rtxt)
+
+        ssrc = _flatten_strings(sources, max_items=120)
+        if ssrc:
+            parts.append("SOURCES: " + " ".join(ssrc))
+        ssamp = _flatten_strings(sample, max_items=240)
+        if ssamp:
+            parts.append("SAMPLE_DATA: " + " ".join(ssamp))
+        return "\n".join(parts).strip()
+
+    renderers = {"full": _render_full, "compact": _render_compact}
+    content = renderers[profile]()
+    index_text = renderers[index_profile]() if index_profile != profile else ""
 
     meta = {
         "nummer": str(idx),
@@ -348,10 +534,17 @@ def hazard_card_to_item(card: Dict[str, Any], idx: int) -> Item:
         "group": _stringify(group),
         "subtype": _stringify(subtype),
     }
-    return Item(content="\n".join(parts).strip(), meta=meta)
+    aliases = _split_aliases([label, *_as_list(card.get("labels")), *alt_list, *_as_list(card.get("keywords"))])
+    return Item(content=content, meta=meta, index_text=index_text, aliases=tuple(aliases))
 
 
-def load_items_any(path_or_inline: Any, *, corpus_name: str) -> List[Item]:
+def load_items_any(
+    path_or_inline: Any,
+    *,
+    corpus_name: str,
+    card_profile: str = DEFAULT_CARD_PROFILE,
+    index_profile: str = DEFAULT_INDEX_PROFILE,
+) -> List[Item]:
     """
     Accepts:
       - filepath string
@@ -405,7 +598,7 @@ def load_items_any(path_or_inline: Any, *, corpus_name: str) -> List[Item]:
             outk: List[Item] = []
             for i, card in enumerate(raw, start=1):
                 if isinstance(card, dict):
-                    outk.append(hazard_card_to_item(card, i))
+                    outk.append(hazard_card_to_item(card, i, profile=card_profile, index_profile=index_profile))
             return outk
 
         # Memory list of log events (eventId/einsatzNr/content/...)
@@ -440,7 +633,7 @@ def _tokenize(text: str) -> List[str]:
 
 
 def _doc_text(it: Item) -> str:
-    parts = [it.content]
+    parts = [it.index_text or it.content]
     for v in (it.meta or {}).values():
         if isinstance(v, str):
             parts.append(v)
@@ -451,19 +644,651 @@ def _doc_text(it: Item) -> str:
     return " ".join([p for p in parts if p])
 
 
+def _bm25_term_weights(bm25: BM25Okapi) -> Tuple[Dict[str, int], sp.csr_matrix]:
+    """
+    Precomputes BM25Okapi's per (term, doc) contribution
+
+        idf(t) * f * (k1 + 1) / (f + k1 * (1 - b + b * |d| / avgdl))
+
+    as a CSR matrix with one row per vocabulary term (postings), so scoring a query is a
+    single sparse dot product instead of a Python loop over query tokens x documents.
+    """
+    vocab: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    tfs: List[int] = []
+    for j, freqs in enumerate(bm25.doc_freqs):
+        for term, f in freqs.items():
+            rows.append(vocab.setdefault(term, len(vocab)))
+            cols.append(j)
+            tfs.append(f)
+
+    r = np.asarray(rows, dtype=np.int64)
+    c = np.asarray(cols, dtype=np.int64)
+    tf = np.asarray(tfs, dtype=np.float64)
+    idf = np.fromiter((bm25.idf.get(t) or 0.0 for t in vocab), dtype=np.float64, count=len(vocab))
+    doc_len = np.asarray(bm25.doc_len, dtype=np.float64)
+    norm = bm25.k1 * (1 - bm25.b + bm25.b * doc_len / bm25.avgdl)
+
+    data = idf[r] * (tf * (bm25.k1 + 1) / (tf + norm[c]))
+    weights = sp.csr_matrix((data, (r, c)), shape=(len(vocab), len(bm25.doc_freqs)))
+    return vocab, weights
+
+
+def select_top_k(
+    scores: np.ndarray,
+    top_k: int,
+    *,
+    min_score: Optional[float] = DEFAULT_MIN_SCORE,
+    rel_score: float = DEFAULT_REL_SCORE,
+) -> Tuple[np.ndarray, int]:
+    """
+    Indices of the top_k scores in descending order (partition + sort of k: O(n + k log k)),
+    minus hits below the score cutoffs. Ties go to the lower index, also at the k-th place, so
+    the order equals the first k of a stable argsort. Returns (indices, number of hits dropped
+    by the cutoffs).
+    """
+    n = int(scores.size)
+    k = min(int(top_k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), 0
+    if k < n:
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        part = np.concatenate([above, np.flatnonzero(scores == kth)[: k - above.size]])
+    else:
+        part = np.arange(n)
+    top = part[np.lexsort((part, -scores[part]))]
+    keep = scores[top] != 0 if min_score is None else scores[top] > min_score
+    best = float(scores[top[0]])
+    if rel_score > 0 and best > 0:
+        keep &= scores[top] >= rel_score * best
+    kept = top[keep]
+    return kept, k - int(kept.size)
+
+
 class BM25Index:
-    def __init__(self, items: List[Item]):
+    def __init__(
+        self,
+        items: List[Item],
+        *,
+        bm25: Optional[BM25Okapi] = None,
+        vocab: Optional[Dict[str, int]] = None,
+        weights: Optional[sp.csr_matrix] = None,
+    ):
         self.items = items
-        self.docs_tokens = [_tokenize(_doc_text(it)) for it in items]
-        self.bm25 = BM25Okapi(self.docs_tokens)
+        if bm25 is None:
+            bm25 = BM25Okapi([_tokenize(_doc_text(it)) for it in items])
+        # kept for its corpus statistics and as the reference scorer
+        self.bm25 = bm25
+        if vocab is None or weights is None:
+            vocab, weights = _bm25_term_weights(bm25)
+        self.vocab = vocab
+        self.weights = weights
+        # memoized snippet-independent renderings (see hazard_catalogue)
+        self.static_blocks: Dict[Tuple[str, int], str] = {}
+        # built on first use (see alias_fast_path)
+        self.alias_automaton: Optional[AliasAutomaton] = None
+
+    def _query_matrix(self, queries_tokens: List[List[str]]) -> sp.csr_matrix:
+        """One row of vocabulary term counts per query (unknown tokens are dropped)."""
+        rows: List[int] = []
+        cols: List[int] = []
+        vals: List[int] = []
+        for i, q_tokens in enumerate(queries_tokens):
+            counts: Dict[int, int] = {}
+            for t in q_tokens:
+                j = self.vocab.get(t)
+                if j is not None:
+                    counts[j] = counts.get(j, 0) + 1
+            rows.extend([i] * len(counts))
+            cols.extend(counts.keys())
+            vals.extend(counts.values())
+        return sp.csr_matrix(
+            (np.asarray(vals, dtype=np.float64), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+            shape=(len(queries_tokens), self.weights.shape[0]),
+        )
 
-    def retrieve(self, query: str, top_k: int) -> List[Tuple[Item, float]]:
+    def get_scores(self, q_tokens: List[str]) -> np.ndarray:
+        """Same scores as BM25Okapi.get_scores (repeated query tokens count repeatedly)."""
+        return (self._query_matrix([q_tokens]) @ self.weights).toarray().ravel()
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        *,
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+    ) -> Tuple[List[Tuple[Item, float]], int]:
+        """retrieve() plus the number of top_k hits dropped by the score cutoffs."""
         q = _tokenize(query)
         if not q:
-            return []
-        scores = self.bm25.get_scores(q)
-        idx = np.argsort(scores)[::-1][:top_k]
-        return [(self.items[i], float(scores[i])) for i in idx]
+            return [], 0
+        scores = self.get_scores(q)
+        idx, dropped = select_top_k(scores, top_k, min_score=min_score, rel_score=rel_score)
+        return [(self.items[i], float(scores[i])) for i in idx], dropped
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int,
+        *,
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+    ) -> List[Tuple[Item, float]]:
+        return self.search(query, top_k, min_score=min_score, rel_score=rel_score)[0]
+
+    def retrieve_many(
+        self,
+        queries: List[str],
+        top_k: int,
+        *,
+        batch_size: int = 1024,
+        min_score: Optional[float] = DEFAULT_MIN_SCORE,
+        rel_score: float = DEFAULT_REL_SCORE,
+    ) -> List[List[Tuple[Item, float]]]:
+        """
+        Batched retrieve(): scores a whole batch as one (queries x docs) sparse product and
+        selects the top_k per row with select_top_k. Queries without tokens yield [].
+        batch_size bounds the dense score block held in memory at once.
+        """
+        bs = int(batch_size)
+        if bs < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size!r}")
+        out: List[List[Tuple[Item, float]]] = []
+        n_docs = len(self.items)
+        k = min(int(top_k), n_docs)
+        for start in range(0, len(queries), bs):
+            toks = [_tokenize(q) for q in queries[start : start + bs]]
+            if k <= 0:
+                out.extend([] for _ in toks)
+                continue
+            scores = (self._query_matrix(toks) @ self.weights).toarray()
+            for q_tokens, row_scores in zip(toks, scores):
+                if not q_tokens:
+                    out.append([])
+                    continue
+                keep, _dropped = select_top_k(row_scores, k, min_score=min_score, rel_score=rel_score)
+                out.append([(self.items[j], float(row_scores[j])) for j in keep])
+        assert len(out) == len(queries), (len(out), len(queries))
+        return out
+
+
+# =============================================================================
+# BM25 index cache (on-disk, shared by concurrent runner processes)
+# =============================================================================
+
+def _normalize_item_meta(items: List[Item], corpus_name: str) -> None:
+    for i, it in enumerate(items, start=1):
+        it.meta = it.meta if isinstance(it.meta, dict) else {"meta": it.meta}
+        it.meta.setdefault("nummer", str(i))
+        it.meta.setdefault("artikel", str(it.meta.get("artikel") or it.meta.get("meta") or corpus_name))
+
+
+_ANALYZER_SOURCE: Optional[str] = None
+
+
+def _analyzer_source() -> str:
+    """
+    Source text of every module line from the Item dataclass through _bm25_term_weights: the
+    JSON reader, card normalization helpers and constants, loaders, tokenizer, BM25 document
+    text and the term-weight matrix, plus _normalize_item_meta. Hashed as a whole, so a helper
+    or constant added to that span is covered without being listed here.
+    """
+    global _ANALYZER_SOURCE
+    if _ANALYZER_SOURCE is None:
+        try:
+            module_lines, _ = inspect.getsourcelines(sys.modules[Item.__module__])
+            _, first = inspect.getsourcelines(Item)
+            last_lines, last = inspect.getsourcelines(_bm25_term_weights)
+            span = module_lines[first - 1 : last - 1 + len(last_lines)]
+            _ANALYZER_SOURCE = "".join(span) + inspect.getsource(_normalize_item_meta)
+        except (OSError, TypeError, KeyError):
+            # no source available (frozen/compiled): fall back to the code objects
+            fns = (load_items_any, hazard_card_to_item, _normalize_item_meta, _doc_text, _tokenize, _bm25_term_weights)
+            _ANALYZER_SOURCE = "\n".join(repr(fn.__code__.co_code) for fn in fns)
+    return _ANALYZER_SOURCE
+
+
+def _analyzer_fingerprint(corpus_name: str, profiles: Tuple[str, str]) -> str:
+    """
+    Everything besides the corpus bytes that shapes an index: payload version, corpus name
+    (selects the loader), profiles, the analyzer source (see _analyzer_source) and the BM25
+    implementation. Editing any of it changes the fingerprint and thereby invalidates existing
+    cache files.
+    """
+    parts = [
+        f"v{INDEX_CACHE_VERSION}",
+        corpus_name,
+        *profiles,
+        f"{BM25Okapi.__module__}.{BM25Okapi.__qualname__}",
+        _analyzer_source(),
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _index_cache_path(path: str, corpus_name: str, profiles: Tuple[str, str]) -> Optional[Tuple[Path, str]]:
+    """
+    Returns (cache file, cache key) for a file-backed corpus, or None if the file is unreadable
+    (the regular loader then reports the problem).
+    """
+    p = Path(path)
+    try:
+        h = hashlib.sha256(p.read_bytes())
+    except OSError:
+        return None
+    h.update(_analyzer_fingerprint(corpus_name, profiles).encode("ascii"))
+    key = h.hexdigest()
+    tag = re.sub(r"[^\w.-]", "_", "-".join([corpus_name, *profiles]))
+    return p.with_name(f"{p.name}.{tag}.{key[:16]}{INDEX_CACHE_SUFFIX}"), key
+
+
+def _load_cached_index(cache_path: Path, key: str) -> Optional[BM25Index]:
+    try:
+        with cache_path.open("rb") as f:
+            payload = pickle.load(f)
+    except Exception:
+        # missing, truncated or written by an incompatible version -> rebuild
+        return None
+    if not isinstance(payload, dict) or payload.get("key") != key:
+        return None
+    items = [Item(content=c, meta=m, index_text=t, aliases=a) for c, m, t, a in payload["items"]]
+    return BM25Index(items, bm25=payload["bm25"], vocab=payload["vocab"], weights=payload["weights"])
+
+
+def _store_cached_index(cache_path: Path, key: str, idx: BM25Index) -> None:
+    """
+    Atomic write (temp file + os.replace) so that concurrent runners never observe a partial
+    cache file. Stale caches of the same corpus are removed; failures are never fatal.
+    """
+    payload = {
+        "key": key,
+        "items": [(it.content, it.meta, it.index_text, it.aliases) for it in idx.items],
+        "bm25": idx.bm25,
+        "vocab": idx.vocab,
+        "weights": idx.weights,
+    }
+    tmp = ""
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=cache_path.name + ".", suffix=".tmp", dir=str(cache_path.parent))
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, cache_path)
+        tmp = ""
+        stem = cache_path.name.rsplit(".", 2)[0]
+        for old in cache_path.parent.glob(f"{stem}.*{INDEX_CACHE_SUFFIX}"):
+            if old != cache_path:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    finally:
+        if tmp:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def _record_stage(timings: Optional[Dict[str, Any]], stage: str, corpus: str, t0: float) -> None:
+    """Per-corpus stage timer: timings[stage][corpus] = seconds since t0 (no-op without timings)."""
+    if timings is not None:
+        timings.setdefault(stage, {})[corpus] = round(time.perf_counter() - t0, 6)
+
+
+def build_corpus_index(
+    corpus_name: str,
+    source: Any,
+    *,
+    use_cache: bool = DEFAULT_INDEX_CACHE,
+    card_profile: str = DEFAULT_CARD_PROFILE,
+    index_profile: str = DEFAULT_INDEX_PROFILE,
+    timings: Optional[Dict[str, Any]] = None,
+) -> Tuple[Optional[BM25Index], str]:
+    """
+    Loads one corpus (path or inline) and builds its BM25 index.
+
+    File-backed corpora are looked up in / written to the on-disk cache, keyed by the file's
+    content hash plus the analyzer fingerprint. Returns (index or None if empty, cache status)
+    with status one of "hit", "miss", "off". `timings` receives load_sec (cache read on a hit)
+    and index_build_sec (including the cache write) for this corpus.
+    """
+    t0 = time.perf_counter()
+    cached: Optional[Tuple[Path, str]] = None
+    if use_cache and isinstance(source, str):
+        cached = _index_cache_path(source, corpus_name, (card_profile, index_profile))
+        if cached is not None:
+            idx = _load_cached_index(*cached)
+            if idx is not None:
+                _record_stage(timings, "load_sec", corpus_name, t0)
+                return idx, "hit"
+
+    items = load_items_any(source, corpus_name=corpus_name, card_profile=card_profile, index_profile=index_profile)
+    _record_stage(timings, "load_sec", corpus_name, t0)
+    if not items:
+        return None, ("miss" if cached else "off")
+    t0 = time.perf_counter()
+    _normalize_item_meta(items, corpus_name)
+    idx = BM25Index(items)
+    if cached is not None:
+        _store_cached_index(cached[0], cached[1], idx)
+    _record_stage(timings, "index_build_sec", corpus_name, t0)
+    return idx, ("miss" if cached else "off")
+
+
+# (corpus name, resolved path, card_profile, index_profile)
+_PoolKey = Tuple[str, str, str, str]
+
+
+class IndexPool:
+    """
+    Keeps BM25 indexes warm across requests (server mode, in-process runners).
+
+    File-backed corpora are keyed by (corpus name, resolved path, profiles) and revalidated
+    against the file's mtime/size on every lookup, so edits on disk are picked up without a
+    restart. At most max_entries indexes are kept (least recently used evicted). Builds run
+    under a per-key lock only: concurrent requests for the same corpus wait for one build, other
+    corpora stay servable. Inline corpora are small and rebuilt per request.
+
+    A reused index reports the cache status a fresh process would see ("hit" once the first
+    build wrote the cache file, "off" without the cache), so results match subprocess runs.
+    """
+
+    def __init__(self, *, use_cache: bool = DEFAULT_INDEX_CACHE, max_entries: int = DEFAULT_INDEX_POOL_MAX):
+        if int(max_entries) < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries!r}")
+        self.use_cache = use_cache
+        self.max_entries = int(max_entries)
+        self._lock = threading.Lock()  # guards _entries and _build_locks; never held while building
+        # key -> (mtime/size stamp, index, built with the on-disk cache)
+        self._entries: OrderedDict[_PoolKey, Tuple[Tuple[int, int], Optional[BM25Index], bool]] = OrderedDict()
+        self._build_locks: Dict[_PoolKey, threading.Lock] = {}
+
+    def _warm(
+        self, key: _PoolKey, stamp: Tuple[int, int], use_cache: bool
+    ) -> Optional[Tuple[Optional[BM25Index], str]]:
+        # caller holds self._lock
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != stamp:
+            return None
+        self._entries.move_to_end(key)
+        _stamp, idx, cached = entry
+        if not use_cache:
+            return idx, "off"
+        # empty corpora never get a cache file (build_corpus_index reports "miss" every time)
+        return idx, ("hit" if cached and idx is not None else "miss")
+
+    def get(
+        self,
+        corpus_name: str,
+        source: Any,
+        *,
+        card_profile: str = DEFAULT_CARD_PROFILE,
+        index_profile: str = DEFAULT_INDEX_PROFILE,
+        timings: Optional[Dict[str, Any]] = None,
+        use_cache: Optional[bool] = None,
+    ) -> Tuple[Optional[BM25Index], str]:
+        """(index, cache status) as from build_corpus_index; use_cache None means the pool's setting."""
+        use_cache = self.use_cache if use_cache is None else bool(use_cache)
+        opts = {"card_profile": card_profile, "index_profile": index_profile, "timings": timings}
+        if not isinstance(source, str):
+            return build_corpus_index(corpus_name, source, use_cache=False, **opts)
+
+        p = Path(source).resolve()
+        try:
+            st = p.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            # let the loader raise its descriptive error
+            return build_corpus_index(corpus_name, source, use_cache=use_cache, **opts)
+
+        key = (corpus_name, str(p), card_profile, index_profile)
+        with self._lock:
+            hit = self._warm(key, stamp, use_cache)
+            if hit is not None:
+                return hit
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                # built by another request while this one waited
+                hit = self._warm(key, stamp, use_cache)
+                if hit is not None:
+                    return hit
+            idx, status = build_corpus_index(corpus_name, str(p), use_cache=use_cache, **opts)
+            with self._lock:
+                self._entries[key] = (stamp, idx, status != "off")
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    old, _entry = self._entries.popitem(last=False)
+                    lock = self._build_locks.get(old)
+                    if lock is not None and not lock.locked():
+                        del self._build_locks[old]
+            return idx, status
+
+    def describe(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"corpus": name, "path": path, "docs": len(idx.items) if idx is not None else 0}
+                for (name, path, *_profiles), (_stamp, idx, _cached) in sorted(self._entries.items())
+            ]
+
+
+# =============================================================================
+# Retrieval query (snippet vs full question)
+# =============================================================================
+
+_SNIPPET_RE = re.compile(r"\bSNIPPET:\s*(.*)\s*$", flags=re.S | re.I)
+
+# A blank line followed by an all-caps "HEADER:" line opens an instruction block after the
+# snippet (testcases.json: "ADDITIONAL REQUIREMENTS:"); the BM25 query ends before it.
+_SNIPPET_TAIL_RE = re.compile(r"\n[ \t]*\n[ \t]*[A-Z][A-Z0-9 _/-]*:[ \t]*(?:\n|$)")
+
+# Instruction lines of the hazard testcase template. They occur in every question and match
+# every card, so snippet mode drops them from the query.
+_TEMPLATE_LINE_RE = re.compile(
+    r"^\s*(?:"
+    r"Hazard classification \(Top-1\)"
+    r"|Output requirements:"
+    r"|ADDITIONAL REQUIREMENTS:"
+    r"|SNIPPET:\s*$"
+    r"|- Direct Answer:"
+    r"|\{\"hazard_id\":"
+    r"|- Do not add any additional text"
+    r"|- After the JSON,"
+    r"|- After the Direct Answer JSON,"
+    r"|\* Observed anomalies"
+    r"|\* Why the chosen hazard matches"
+    r"|\* 1.3 close alternatives"
+    r"|\* What would confirm/deny"
+    r"|No natural-language hints are provided\."
+    r"|The snippet is a raw telemetry"
+    r")",
+    flags=re.I,
+)
+
+
+def extract_snippet(question: str) -> str:
+    m = _SNIPPET_RE.search(question or "")
+    return m.group(1).strip() if m else (question or "").strip()
+
+
+def retrieval_query(question: str, mode: str = DEFAULT_QUERY_MODE) -> str:
+    """
+    BM25 query text for `question`. "full" returns the question unchanged (paper runs);
+    "snippet" returns the text after SNIPPET: up to a trailing all-caps section header, or
+    the question if it has no marker; template lines are dropped in both cases.
+    """
+    if mode == "full":
+        return question
+    text = question or ""
+    m = _SNIPPET_RE.search(text)
+    if m and m.group(1).strip():
+        text = m.group(1)
+        tail = _SNIPPET_TAIL_RE.search(text)
+        if tail:
+            text = text[: tail.start()]
+    kept = [ln for ln in text.splitlines() if not _TEMPLATE_LINE_RE.match(ln)]
+    return "\n".join(kept).strip() or question
+
+
+# =============================================================================
+# Alias fast path (Aho-Corasick over card aliases)
+# =============================================================================
+
+def _normalize_alias_text(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class AliasAutomaton:
+    """
+    Aho-Corasick automaton over normalized aliases. scan() walks the text once
+    (O(len(text) + matches)) and reports whole-word matches only.
+    """
+
+    def __init__(self, owners: Dict[str, List[str]]):
+        self.patterns: List[str] = list(owners)
+        self.owners: List[Tuple[str, ...]] = [tuple(owners[p]) for p in self.patterns]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(pid)
+
+        # breadth-first failure links; outputs inherit the outputs of their failure state
+        queue = list(self._goto[0].values())
+        for r in queue:
+            for ch, state in self._goto[r].items():
+                queue.append(state)
+                f = self._fail[r]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[state] = self._goto[f].get(ch, 0)
+                self._out[state] = self._out[state] + self._out[self._fail[state]]
+
+    def scan(self, text: str) -> List[Tuple[int, int]]:
+        """Returns (pattern id, start offset) for every whole-word match in normalized text."""
+        hits: List[Tuple[int, int]] = []
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid in out[state]:
+                start = i - len(self.patterns[pid]) + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if i + 1 < n and text[i + 1].isalnum():
+                    continue
+                hits.append((pid, start))
+        return hits
+
+
+def _alias_automaton(idx: BM25Index) -> AliasAutomaton:
+    if idx.alias_automaton is None:
+        owners: Dict[str, List[str]] = {}
+        for it in idx.items:
+            hid = str((it.meta or {}).get("hazard_id") or "")
+            if not hid:
+                continue
+            for alias in it.aliases:
+                key = _normalize_alias_text(alias)
+                if len(key) >= FAST_PATH_MIN_ALIAS_CHARS and hid not in owners.setdefault(key, []):
+                    owners[key].append(hid)
+        idx.alias_automaton = AliasAutomaton(owners)
+    return idx.alias_automaton
+
+
+def alias_fast_path(
+    idx: BM25Index, snippet: str, query: str, min_margin: float = DEFAULT_FAST_PATH_MARGIN
+) -> Tuple[Optional[Tuple[Item, float]], Dict[str, Any]]:
+    """
+    Deterministic Knowledge lookup: returns ((item, score), info) when every alias found in the
+    snippet belongs to the same hazard and that hazard is BM25 top-1 for `query` with a relative
+    margin >= min_margin; otherwise (None, info). info explains the decision for metrics.
+    """
+    ac = _alias_automaton(idx)
+    spans = [(start, start + len(ac.patterns[pid]), pid) for pid, start in ac.scan(_normalize_alias_text(snippet))]
+    # longest match wins: "tanganyika laughter epidemic" does not also vote for "epidemic"
+    matches = [
+        (pid, a)
+        for a, b, pid in spans
+        if not any(a2 <= a and b <= b2 and (b2 - a2) > (b - a) for a2, b2, _p in spans)
+    ]
+    matched = sorted({ac.patterns[pid] for pid, _start in matches})
+    hazards = sorted({hid for pid, _start in matches for hid in ac.owners[pid]})
+    info: Dict[str, Any] = {
+        "enabled": True,
+        "hit": False,
+        "matched_aliases": matched[:20],
+        "candidates": hazards[:20],
+        "bm25_margin": None,
+        "reason": "",
+    }
+    if len(hazards) != 1:
+        info["reason"] = "no_alias_match" if not hazards else "ambiguous_aliases"
+        return None, info
+
+    scores = idx.get_scores(_tokenize(query))
+    if scores.size == 0 or float(scores.max()) <= 0:
+        info["reason"] = "no_bm25_scores"
+        return None, info
+    top2 = np.argpartition(-scores, 1)[:2] if scores.size > 1 else np.array([0])
+    top2 = top2[np.argsort(-scores[top2], kind="stable")]
+    s1 = float(scores[top2[0]])
+    s2 = float(scores[top2[1]]) if top2.size > 1 else 0.0
+    best = idx.items[int(top2[0])]
+    margin = (s1 - s2) / s1
+    info["bm25_margin"] = round(margin, 4)
+
+    if str(best.meta.get("hazard_id") or "") != hazards[0]:
+        info["reason"] = "bm25_disagrees"
+        return None, info
+    if margin < min_margin:
+        info["reason"] = "bm25_margin_too_small"
+        return None, info
+
+    info.update({"hit": True, "hazard_id": hazards[0], "reason": "alias_and_bm25"})
+    return (best, s1), info
+
+
+def fast_path_answer(hit: Tuple[Item, float], info: Dict[str, Any]) -> str:
+    """Renders the fast-path decision in the same Direct Answer format as the LLM output."""
+    it, _score = hit
+    meta = it.meta or {}
+    cite = f"[Knowledge:{meta.get('nummer', '?')} {meta.get('hazard_id', '')} {meta.get('label', '')}]"
+    answer = {
+        "hazard_id": meta.get("hazard_id", ""),
+        "label": meta.get("label", ""),
+        "confidence": round(0.5 + 0.5 * float(info.get("bm25_margin") or 0.0), 2),
+        "evidence": [cite],
+        "notes": "alias fast path (no LLM call)",
+    }
+    aliases = ", ".join(f'"{a}"' for a in info.get("matched_aliases") or [])
+    return (
+        "1) Direct Answer\n"
+        f"{json.dumps(answer, ensure_ascii=False)}\n\n"
+        "2) Justification\n"
+        f"- Snippet contains {aliases}, aliases only of this hazard {cite}.\n"
+        f"- BM25 ranks it first with a relative margin of {info.get('bm25_margin')}."
+    )
 
 
 def _ordered_corpora(indexes: Dict[str, BM25Index]) -> List[str]:
@@ -483,9 +1308,15 @@ def _truncate_context(text: str, limit: int) -> str:
     return head + " …"
 
 
-def format_hits(hits: List[Tuple[Item, float]], corpus_name: str, per_doc_chars: int = 1200) -> str:
+def format_hits(
+    hits: List[Tuple[Item, float]], corpus_name: str, per_doc_chars: int = 1200, *, refs_only: bool = False
+) -> str:
+    """
+    One cited block per hit. refs_only renders the citation and BM25 score without the content,
+    for hits whose full text is already in the prompt (catalogue "cards").
+    """
     lines: List[str] = []
-    for it, _score in hits:
+    for it, score in hits:
         meta = it.meta or {}
         nummer = meta.get("nummer", "?")
         artikel = meta.get("artikel", "") or ""
@@ -500,6 +1331,11 @@ def format_hits(hits: List[Tuple[Item, float]], corpus_name: str, per_doc_chars:
             tag = f"#{einsatz}" if einsatz else (f"evt:{event_id}" if event_id else "")
             cite = f"[{corpus_name}:{nummer} {tag} {artikel}]".strip()
 
+        if refs_only:
+            rank = "recent" if score < 0 else f"BM25 {score:.2f}"
+            lines.append(f"{cite} ({rank}; full text in the HAZARD CATALOGUE)")
+            continue
+
         txt = it.content or ""
         if per_doc_chars and len(txt) > per_doc_chars:
             txt = _truncate_context(txt, per_doc_chars)
@@ -508,6 +1344,45 @@ def format_hits(hits: List[Tuple[Item, float]], corpus_name: str, per_doc_chars:
     return "\n\n".join(lines)
 
 
+def hazard_catalogue(idx: BM25Index, mode: str = DEFAULT_CATALOGUE, per_doc_chars: int = DEFAULT_PER_DOC_CHARS) -> str:
+    """
+    Snippet-independent Knowledge block for the cacheable layout, ordered deterministically so
+    the rendered prompt prefix is byte-identical across requests:
+      - digest: one citation line per card, grouped by hazard group (sorted), then hazard_id
+      - cards:  every card as in format_hits, sorted by hazard_id
+    Memoized on the index, so warm indexes render it once.
+    """
+    key = (mode, int(per_doc_chars) if mode == "cards" else 0)
+    if key in idx.static_blocks:
+        return idx.static_blocks[key]
+
+    def _hid(it: Item) -> str:
+        return str((it.meta or {}).get("hazard_id") or "")
+
+    if mode == "cards":
+        hits = [(it, 0.0) for it in sorted(idx.items, key=lambda it: (_hid(it), it.meta.get("nummer", "")))]
+        block = format_hits(hits, corpus_name="Knowledge", per_doc_chars=per_doc_chars)
+    elif mode == "digest":
+        groups: Dict[str, List[Item]] = {}
+        for it in idx.items:
+            groups.setdefault(str((it.meta or {}).get("group") or "Other"), []).append(it)
+        lines: List[str] = []
+        for group in sorted(groups):
+            lines.append(f"#### {group}")
+            for it in sorted(groups[group], key=lambda it: (_hid(it), it.meta.get("nummer", ""))):
+                meta = it.meta or {}
+                cite = f"[Knowledge:{meta.get('nummer', '?')} {meta.get('hazard_id', '')} {meta.get('label', '')}]"
+                sub = str(meta.get("subtype") or "").strip()
+                lines.append(f"{cite} {sub}".rstrip())
+            lines.append("")
+        block = "\n".join(lines).strip()
+    else:
+        raise ValueError(f"unknown catalogue mode: {mode!r} (expected one of {CATALOGUE_MODES})")
+
+    idx.static_blocks[key] = block
+    return block
+
+
 def _dedupe_hits(hits: List[Tuple[Item, float]]) -> List[Tuple[Item, float]]:
     seen = set()
     out = []
@@ -520,61 +1395,479 @@ def _dedupe_hits(hits: List[Tuple[Item, float]]) -> List[Tuple[Item, float]]:
     return out
 
 
+def _estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN_EST - 1) // CHARS_PER_TOKEN_EST
+
+
+def _pack_hits(
+    per_corpus_hits: Dict[str, List[Tuple[Item, float]]],
+    corpus_order: List[str],
+    per_doc_chars: int,
+    token_budget: int,
+    ref_corpora: Collection[str] = (),
+) -> Tuple[Dict[str, List[Tuple[Item, float]]], int]:
+    """
+    Greedy packing across corpora: candidates are taken by descending score (ties follow
+    CORPUS_ORDER, then retrieval rank; recency-only hits carry -1 and come last) until the next
+    one would exceed token_budget. Kept hits retain their per-corpus retrieval order.
+    Hits of ref_corpora are costed as the reference lines they render to.
+    Returns (kept hits per corpus, estimated context tokens).
+    """
+    rank = {c: i for i, c in enumerate(corpus_order)}
+    cands = [
+        (-sc, rank[corpus], pos, corpus, it, sc)
+        for corpus, hits in per_corpus_hits.items()
+        for pos, (it, sc) in enumerate(hits)
+    ]
+    cands.sort(key=lambda x: x[:3])
+
+    used = 0
+    kept: Dict[str, List[Tuple[int, Item, float]]] = {}
+    for _neg, _r, pos, corpus, it, sc in cands:
+        block = format_hits([(it, sc)], corpus_name=corpus, per_doc_chars=per_doc_chars, refs_only=corpus in ref_corpora)
+        cost = _estimate_tokens(block + "\n\n")
+        if corpus not in kept:
+            cost += _estimate_tokens(f"### {corpus}\n\n\n")
+        if used + cost > token_budget:
+            break
+        used += cost
+        kept.setdefault(corpus, []).append((pos, it, sc))
+
+    out = {c: [(it, sc) for _pos, it, sc in sorted(v, key=lambda x: x[0])] for c, v in kept.items()}
+    return out, used
+
+
+def adaptive_cut(
+    scores: np.ndarray,
+    mode: str,
+    *,
+    min_k: int = DEFAULT_ADAPTIVE_MIN_K,
+    max_k: int = DEFAULT_ADAPTIVE_MAX_K,
+    mass: float = DEFAULT_ADAPTIVE_MASS,
+) -> int:
+    """
+    Number of hits to keep from descending `scores`.
+      knee: the point farthest below the chord from the first to the last score (Kneedle on the
+            curve normalized to [0, 1] x [0, 1]); a steep drop after a few hits cuts early.
+      mass: the shortest prefix holding `mass` of the total score above the weakest candidate.
+    """
+    n = int(scores.size)
+    if mode == "off" or n == 0:
+        return n
+    lo = max(1, int(min_k))
+    hi = min(n, int(max_k)) if max_k and max_k > 0 else n
+    span = float(scores[0] - scores[-1])
+    if n < 3 or span <= 0:
+        return hi  # no shape to cut on: keep the broad recall
+    if mode == "knee":
+        x = np.arange(n) / (n - 1)
+        y = (scores - scores[-1]) / span
+        cut = int(np.argmax((1.0 - x) - y)) + 1
+    else:
+        cum = np.cumsum(scores - scores[-1])
+        cut = int(np.searchsorted(cum, mass * cum[-1])) + 1
+    return min(max(cut, lo), hi)
+
+
 def build_context(
     indexes: Dict[str, BM25Index],
     query: str,
     top_k: Dict[str, int],
     per_doc_chars: int,
     recent_k: Optional[Dict[str, int]] = None,
-) -> Tuple[str, Dict[str, str]]:
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    min_score: Optional[float] = DEFAULT_MIN_SCORE,
+    rel_score: float = DEFAULT_REL_SCORE,
+    adaptive_k: str = DEFAULT_ADAPTIVE_K,
+    adaptive_min_k: int = DEFAULT_ADAPTIVE_MIN_K,
+    adaptive_max_k: int = DEFAULT_ADAPTIVE_MAX_K,
+    adaptive_mass: float = DEFAULT_ADAPTIVE_MASS,
+    timings: Optional[Dict[str, Any]] = None,
+    ref_corpora: Collection[str] = (),
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Returns:
+      - full context (markdown)
+      - per-corpus blocks
+      - stats (candidate/kept/dropped hits per corpus, adaptive cut, estimated context tokens)
+
+    BM25 hits below min_score / rel_score (see select_top_k) never enter the candidate pool.
+    With adaptive_k != "off", each corpus' BM25 hits are cut by adaptive_cut() before the
+    recent_k hits are added.
+    With token_budget > 0, top_k/recent_k only define the candidate pool and hits from all
+    corpora are packed by score until the (estimated) budget is used up.
+    `timings` receives retrieval_sec per corpus and context_format_sec (packing + formatting).
+    Hits of ref_corpora (full text already in the prompt) are rendered as citation + score only.
+    """
     recent_k = recent_k or {}
-    per: Dict[str, str] = {}
-    blocks: List[str] = []
+    corpora = _ordered_corpora(indexes)
+    per_corpus_hits: Dict[str, List[Tuple[Item, float]]] = {}
+    dropped: Dict[str, int] = {}
+    adaptive: Dict[str, int] = {}
 
-    for corpus in _ordered_corpora(indexes):
+    for corpus in corpora:
+        t0 = time.perf_counter()
         idx = indexes[corpus]
         k = int(top_k.get(corpus, 0))
         rk = int(recent_k.get(corpus, 0))
 
         hits: List[Tuple[Item, float]] = []
+        dropped[corpus] = 0
         if k > 0:
-            hits.extend(idx.retrieve(query, k))
+            bm25_hits, dropped[corpus] = idx.search(query, k, min_score=min_score, rel_score=rel_score)
+            if adaptive_k != "off":
+                cut = adaptive_cut(
+                    np.asarray([sc for _it, sc in bm25_hits]),
+                    adaptive_k,
+                    min_k=adaptive_min_k,
+                    max_k=adaptive_max_k,
+                    mass=adaptive_mass,
+                )
+                bm25_hits = bm25_hits[:cut]
+                adaptive[corpus] = cut
+            hits.extend(bm25_hits)
 
         if rk > 0:
             recent_items = idx.items[-rk:]
             hits.extend([(it, -1.0) for it in reversed(recent_items)])
 
-        hits = _dedupe_hits(hits)
-        block = format_hits(hits, corpus_name=corpus, per_doc_chars=per_doc_chars)
+        per_corpus_hits[corpus] = _dedupe_hits(hits)
+        _record_stage(timings, "retrieval_sec", corpus, t0)
+
+    t0 = time.perf_counter()
+    kept = per_corpus_hits
+    if token_budget and token_budget > 0:
+        kept, _used = _pack_hits(per_corpus_hits, corpora, per_doc_chars, int(token_budget), ref_corpora)
+
+    per: Dict[str, str] = {}
+    blocks: List[str] = []
+    for corpus in corpora:
+        block = format_hits(
+            kept.get(corpus, []), corpus_name=corpus, per_doc_chars=per_doc_chars, refs_only=corpus in ref_corpora
+        )
         per[corpus] = block
         if block.strip():
             blocks.append(f"### {corpus}\n{block}")
 
-    return "\n\n".join(blocks).strip(), per
+    context = "\n\n".join(blocks).strip()
+    if timings is not None:
+        timings["context_format_sec"] = round(time.perf_counter() - t0, 6)
+    stats = {
+        "candidate_hits": {c: len(per_corpus_hits[c]) for c in corpora},
+        "kept_hits": {c: len(kept.get(c, [])) for c in corpora},
+        "dropped_hits": dropped,
+        "adaptive_k": adaptive_k,
+        "adaptive_kept": adaptive,
+        "context_chars": len(context),
+        "context_tokens_est": _estimate_tokens(context),
+    }
+    return context, per, stats
 
 
 # =============================================================================
 # LLM client (ONE CALL ONLY)
 # =============================================================================
 
+def _normalize_prompt_text(text: str) -> str:
+    lines = (text or "").replace("\r\n", "\n").replace("\r", "\n").strip().split("\n")
+    return "\n".join(line.rstrip() for line in lines)
+
+
+class ResponseCache:
+    """
+    Content-addressed disk cache of chat completions: one JSON file per
+    sha256(model, system, user, temperature, max_tokens) over whitespace-normalized prompts.
+    Hits touch the file; once the directory exceeds max_bytes the least recently used
+    files (oldest mtime) are evicted; max_mb <= 0 leaves the directory unbounded.
+    With replay=True a miss raises instead of calling the LLM.
+    """
+
+    def __init__(self, root: str, *, max_mb: float = DEFAULT_LLM_CACHE_MAX_MB, replay: bool = DEFAULT_LLM_CACHE_REPLAY):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        max_bytes = int(float(max_mb) * 1024 * 1024)
+        self.max_bytes: Optional[int] = max_bytes if max_bytes > 0 else None
+        self.replay = bool(replay)
+
+    @staticmethod
+    def key(model: str, system: str, user: str, temperature: float, max_tokens: int, variant: str = "") -> str:
+        fields: Dict[str, Any] = {
+            "model": model,
+            "system": _normalize_prompt_text(system),
+            "user": _normalize_prompt_text(user),
+            "temperature": float(temperature),
+            "max_tokens": int(max_tokens),
+        }
+        if variant:
+            fields["variant"] = variant
+        blob = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        p = self._path(key)
+        try:
+            entry = json.loads(p.read_text(encoding="utf-8"))
+            os.utime(p)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and isinstance(entry.get("text"), str) else None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        fd, tmp = tempfile.mkstemp(prefix=f".{key[:16]}.", suffix=".tmp", dir=str(self.root))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        max_bytes = self.max_bytes
+        if max_bytes is None:
+            return
+        files = []
+        total = 0
+        with os.scandir(self.root) as it:
+            for e in it:
+                if e.name.endswith(".json") and e.is_file():
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime, st.st_size, e.path))
+                    total += st.st_size
+        if total <= max_bytes:
+            return
+        for _mtime, size, path in sorted(files):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= max_bytes:
+                break
+
+
+def response_cache_from_config(llm_cfg: Dict[str, Any]) -> Optional[ResponseCache]:
+    cache_dir = str(llm_cfg.get("cache_dir", DEFAULT_LLM_CACHE_DIR) or "")
+    if not cache_dir:
+        if llm_cfg.get("cache_replay"):
+            raise ValueError("llm.cache_replay requires llm.cache_dir")
+        return None
+    return ResponseCache(
+        cache_dir,
+        max_mb=float(llm_cfg.get("cache_max_mb", DEFAULT_LLM_CACHE_MAX_MB) or 0),
+        replay=bool(llm_cfg.get("cache_replay", DEFAULT_LLM_CACHE_REPLAY)),
+    )
+
+
+def cache_metrics(cache: Optional[ResponseCache], chat: Any) -> Dict[str, Any]:
+    status = getattr(chat, "last_cache", "off")
+    return {
+        "mode": ("off" if cache is None else ("replay" if cache.replay else "readwrite")),
+        "hits": int(status == "hit"),
+        "misses": int(status == "miss"),
+    }
+
+
+class _DirectAnswerWatcher:
+    """
+    Incremental scanner for streamed completions. Tracks brace depth (ignoring braces inside
+    JSON strings) and reports the first complete JSON object carrying a non-empty hazard_id.
+    Braces/quotes in surrounding prose are skipped until an object starts.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.end = -1
+        self._pos = 0
+        self._depth = 0
+        self._start = -1
+        self._in_str = False
+        self._esc = False
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        self.text += chunk or ""
+        t = self.text
+        while self._pos < len(t):
+            ch = t[self._pos]
+            self._pos += 1
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth, self._start = 1, self._pos - 1
+                continue
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+                continue
+            if ch == '"':
+                self._in_str = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        obj = json.loads(t[self._start : self._pos])
+                    except json.JSONDecodeError:
+                        continue
+                    hid = obj.get("hazard_id") if isinstance(obj, dict) else None
+                    if isinstance(hid, str) and hid.strip():
+                        self.end = self._pos
+                        return obj
+        return None
+
+
 class LocalChat:
-    def __init__(self, base_url: str, model: str, api_key: str = DEFAULT_API_KEY):
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        api_key: str = DEFAULT_API_KEY,
+        *,
+        cache: Optional[ResponseCache] = None,
+    ):
         self.client = OpenAI(base_url=base_url, api_key=api_key)
         self.model = model
+        self.cache = cache
+        # response cache outcome of the last call: "hit" | "miss" | "off"
+        self.last_cache = "off"
+        # token accounting of the last call, as reported by the server (may be empty)
+        self.last_usage: Dict[str, Any] = {}
+        # streaming details of the last call: {"ttft_sec": float|None, "early_stopped": bool}
+        self.last_stream: Dict[str, Any] = {}
+        # llama.cpp-style server timings (cache_n, prompt_n, ...), if the server sends them
+        self.last_timings: Dict[str, Any] = {}
+
+    def chat(
+        self,
+        system: str,
+        user: str,
+        temperature: float,
+        max_tokens: int,
+        *,
+        stream: bool = DEFAULT_STREAM,
+        stop_after_answer: bool = DEFAULT_STOP_AFTER_ANSWER,
+    ) -> str:
+        key = ""
+        if self.cache is not None:
+            key = ResponseCache.key(
+                self.model,
+                system,
+                user,
+                temperature,
+                max_tokens,
+                # an early-stopped answer is truncated, so it must not be served to full requests
+                variant="stop_after_answer" if stream and stop_after_answer else "",
+            )
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.last_cache = "hit"
+                self.last_usage = hit.get("usage") or {}
+                self.last_timings = hit.get("timings") or {}
+                self.last_stream = {}
+                return hit["text"]
+            if self.cache.replay:
+                raise RuntimeError(f"LLM cache miss in replay mode (model={self.model}, key={key[:16]})")
+        self.last_cache = "miss" if key else "off"
+
+        messages = [
+            {"role": "system", "content": (system or "").strip()},
+            {"role": "user", "content": (user or "").strip()},
+        ]
+        if stream:
+            text = self._chat_stream(messages, temperature, max_tokens, stop_after_answer=stop_after_answer)
+        else:
+            resp = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            raw = resp.model_dump() if hasattr(resp, "model_dump") else json.loads(resp.json())
+            self.last_usage = (raw or {}).get("usage") or {}
+            self.last_timings = (raw or {}).get("timings") or {}
+            self.last_stream = {}
+            msg = (((raw or {}).get("choices") or [{}])[0].get("message") or {})
+            text = (msg.get("content") or "").strip()
+
+        if key:
+            self.cache.put(key, {"model": self.model, "text": text, "usage": self.last_usage, "timings": self.last_timings})
+        return text
+
+    def _chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        *,
+        stop_after_answer: bool,
+    ) -> str:
+        """
+        Streams the completion. With stop_after_answer, the HTTP stream is closed as soon as the
+        Direct Answer JSON is complete (the server then aborts generation) and the text is cut
+        right after that object; the justification section is dropped in that case.
+        """
+        t0 = time.perf_counter()
+        ttft: Optional[float] = None
+        watcher = _DirectAnswerWatcher()
+        self.last_usage = {}
+        self.last_timings = {}
+        early = False
 
-    def chat(self, system: str, user: str, temperature: float, max_tokens: int) -> str:
         resp = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": (system or "").strip()},
-                {"role": "user", "content": (user or "").strip()},
-            ],
+            messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
         )
-        raw = resp.model_dump() if hasattr(resp, "model_dump") else json.loads(resp.json())
-        msg = (((raw or {}).get("choices") or [{}])[0].get("message") or {})
-        return (msg.get("content") or "").strip()
+        try:
+            for chunk in resp:
+                if getattr(chunk, "usage", None):
+                    u = chunk.usage
+                    self.last_usage = u.model_dump() if hasattr(u, "model_dump") else dict(u)
+                if getattr(chunk, "timings", None):
+                    self.last_timings = dict(chunk.timings)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if not delta:
+                    continue
+                if ttft is None:
+                    ttft = time.perf_counter() - t0
+                if watcher.feed(delta) is not None and stop_after_answer:
+                    early = True
+                    break
+        finally:
+            resp.close()
+
+        self.last_stream = {"ttft_sec": ttft, "early_stopped": early}
+        text = watcher.text[: watcher.end] if early else watcher.text
+        return text.strip()
+
+
+def _cached_prompt_tokens(usage: Dict[str, Any], timings: Dict[str, Any]) -> Optional[int]:
+    """Prompt tokens served from the server's prompt cache (OpenAI-style usage or llama.cpp timings)."""
+    details = usage.get("prompt_tokens_details") or {}
+    if isinstance(details, dict) and details.get("cached_tokens") is not None:
+        return int(details["cached_tokens"])
+    if timings.get("cache_n") is not None:
+        return int(timings["cache_n"])
+    return None
 
 
 def count_inline_citations(text: str) -> int:
@@ -623,7 +1916,11 @@ def render_markdown(res: Dict[str, Any]) -> str:
 # Runner
 # =============================================================================
 
-def run_simple_rag_hazard_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
+def run_simple_rag_hazard_one_shot(req: Dict[str, Any], *, pool: Optional[IndexPool] = None) -> Dict[str, Any]:
+    """
+    One classification for one request.json payload. Passing a pool reuses warm indexes
+    (server mode / in-process runners); otherwise indexes come from the on-disk cache.
+    """
     question = str(req.get("question", "") or "").strip()
     if not question:
         raise ValueError("request.question is required")
@@ -634,51 +1931,160 @@ def run_simple_rag_hazard_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
     api_key = str(llm_cfg.get("api_key", DEFAULT_API_KEY))
     temperature = float(llm_cfg.get("temperature", DEFAULT_TEMPERATURE))
     max_tokens = int(llm_cfg.get("max_tokens", DEFAULT_MAX_TOKENS))
+    stream = bool(llm_cfg.get("stream", DEFAULT_STREAM))
+    stop_after_answer = bool(llm_cfg.get("stop_after_answer", DEFAULT_STOP_AFTER_ANSWER))
 
     ret_cfg = req.get("retrieval") or {}
     top_k = ret_cfg.get("top_k") or dict(DEFAULT_TOP_K)
     recent_k = ret_cfg.get("recent_k") or dict(DEFAULT_RECENT_K)
     per_doc_chars = int(ret_cfg.get("per_doc_chars", DEFAULT_PER_DOC_CHARS))
     min_citations = int(ret_cfg.get("min_citations", DEFAULT_MIN_CITATIONS))
+    use_index_cache = bool(ret_cfg.get("index_cache", DEFAULT_INDEX_CACHE))
+    token_budget = int(ret_cfg.get("token_budget", DEFAULT_TOKEN_BUDGET) or 0)
+    prompt_layout = str(ret_cfg.get("prompt_layout", DEFAULT_PROMPT_LAYOUT))
+    catalogue_mode = str(ret_cfg.get("catalogue", DEFAULT_CATALOGUE))
+    fast_path_enabled = bool(ret_cfg.get("fast_path", DEFAULT_FAST_PATH))
+    fast_path_margin = float(ret_cfg.get("fast_path_margin", DEFAULT_FAST_PATH_MARGIN))
+    card_profile = str(ret_cfg.get("card_profile", DEFAULT_CARD_PROFILE))
+    index_profile = str(ret_cfg.get("index_profile", DEFAULT_INDEX_PROFILE))
+    query_mode = str(ret_cfg.get("query_mode", DEFAULT_QUERY_MODE))
+    min_score = ret_cfg.get("min_score", DEFAULT_MIN_SCORE)
+    min_score = None if min_score is None else float(min_score)
+    rel_score = float(ret_cfg.get("rel_score", DEFAULT_REL_SCORE))
+    adaptive_k = str(ret_cfg.get("adaptive_k", DEFAULT_ADAPTIVE_K))
+    if adaptive_k not in ADAPTIVE_K_MODES:
+        raise ValueError(f"retrieval.adaptive_k must be one of {ADAPTIVE_K_MODES}, got {adaptive_k!r}")
+    if query_mode not in QUERY_MODES:
+        raise ValueError(f"retrieval.query_mode must be one of {QUERY_MODES}, got {query_mode!r}")
+    for key, prof in (("card_profile", card_profile), ("index_profile", index_profile)):
+        if prof not in CARD_PROFILES:
+            raise ValueError(f"retrieval.{key} must be one of {CARD_PROFILES}, got {prof!r}")
+    if prompt_layout not in PROMPT_LAYOUTS:
+        raise ValueError(f"retrieval.prompt_layout must be one of {PROMPT_LAYOUTS}, got {prompt_layout!r}")
 
     corpora = req.get("corpora") or {}
     if not isinstance(corpora, dict) or not corpora:
         raise ValueError("request.corpora must be a dict of corpus_name -> items")
 
-    # Build indexes (hazard-aware loader)
+    # Build indexes (hazard-aware loader, on-disk cache for file-backed corpora)
+    t_start = time.perf_counter()
+    timings: Dict[str, Any] = {}
     indexes: Dict[str, BM25Index] = {}
+    index_cache: Dict[str, str] = {}
     for corpus_name, source in corpora.items():
         # Hard fail on empty string path (common runner bug)
         if isinstance(source, str) and not source.strip():
             raise ValueError(f"corpora.{corpus_name} is an empty string path")
 
-        items = load_items_any(source, corpus_name=corpus_name)
-        if items:
-            for i, it in enumerate(items, start=1):
-                it.meta = it.meta if isinstance(it.meta, dict) else {"meta": it.meta}
-                it.meta.setdefault("nummer", str(i))
-                it.meta.setdefault("artikel", str(it.meta.get("artikel") or it.meta.get("meta") or corpus_name))
-            indexes[corpus_name] = BM25Index(items)
-
-    context, per_corpus = build_context(
-        indexes, question, top_k=top_k, per_doc_chars=per_doc_chars, recent_k=recent_k
+        if pool is not None:
+            idx, index_cache[corpus_name] = pool.get(
+                corpus_name,
+                source,
+                card_profile=card_profile,
+                index_profile=index_profile,
+                timings=timings,
+                use_cache=use_index_cache,
+            )
+        else:
+            idx, index_cache[corpus_name] = build_corpus_index(
+                corpus_name,
+                source,
+                use_cache=use_index_cache,
+                card_profile=card_profile,
+                index_profile=index_profile,
+                timings=timings,
+            )
+        if idx is not None:
+            indexes[corpus_name] = idx
+
+    snippet = extract_snippet(question)
+    query = retrieval_query(question, query_mode)
+    query_stats = {"query_mode": query_mode, "query_tokens": len(_tokenize(query))}
+
+    fast_path: Dict[str, Any] = {"enabled": False, "hit": False}
+    if fast_path_enabled and "Knowledge" in indexes:
+        hit, fast_path = alias_fast_path(indexes["Knowledge"], snippet, query, fast_path_margin)
+        if hit is not None:
+            final = fast_path_answer(hit, fast_path)
+            c_count = count_inline_citations(final)
+            timings["total_sec"] = round(time.perf_counter() - t_start, 6)
+            return {
+                "final": final,
+                "contexts": {"pass1": {"Knowledge": format_hits([hit], "Knowledge", per_doc_chars)}, "pass2": {}},
+                "metrics": {
+                    "citation_count": c_count,
+                    "min_citations_threshold": min_citations,
+                    "has_min_citations": bool(c_count >= min_citations),
+                    "uses_retrieval": True,
+                    "llm_calls": 0,
+                    "index_cache": index_cache,
+                    "card_profile": card_profile,
+                    "index_profile": index_profile,
+                    **query_stats,
+                    "fast_path": fast_path,
+                    "timings": timings,
+                },
+                "meta": {"mode": "simple_rag_hazard_one_shot", "model": model, "base_url": base_url, "question": question},
+            }
+
+    catalogue = ""
+    ref_corpora: Tuple[str, ...] = ()
+    if prompt_layout == "cacheable" and "Knowledge" in indexes:
+        catalogue = hazard_catalogue(indexes["Knowledge"], catalogue_mode, per_doc_chars)
+        if catalogue_mode == "cards":
+            # every card is already in the catalogue: cite the Knowledge hits, don't repeat them
+            ref_corpora = ("Knowledge",)
+
+    def _render_prompt(ctx: str) -> str:
+        if prompt_layout == "cacheable":
+            return PROMPT_HAZARD_CLASSIFY_CACHEABLE.format(catalogue=catalogue, context=ctx, snippet=snippet)
+        return PROMPT_HAZARD_CLASSIFY.format(context=ctx, snippet=snippet)
+
+    # the budget covers the whole prompt: reserve system prompt, template and snippet first
+    context_budget = 0
+    if token_budget > 0:
+        fixed = _estimate_tokens(SYSTEM_DEFAULT) + _estimate_tokens(_render_prompt(""))
+        context_budget = max(1, token_budget - fixed)
+
+    context, per_corpus, ctx_stats = build_context(
+        indexes,
+        query,
+        top_k=top_k,
+        per_doc_chars=per_doc_chars,
+        recent_k=recent_k,
+        token_budget=context_budget,
+        min_score=min_score,
+        rel_score=rel_score,
+        adaptive_k=adaptive_k,
+        adaptive_min_k=int(ret_cfg.get("adaptive_min_k", DEFAULT_ADAPTIVE_MIN_K)),
+        adaptive_max_k=int(ret_cfg.get("adaptive_max_k", DEFAULT_ADAPTIVE_MAX_K)),
+        adaptive_mass=float(ret_cfg.get("adaptive_mass", DEFAULT_ADAPTIVE_MASS)),
+        timings=timings,
+        ref_corpora=ref_corpora,
     )
+    prompt = _render_prompt(context)
 
-    # extract snippet if present
-    snippet = question
-    m = re.search(r"\bSNIPPET:\s*(.*)\s*$", question, flags=re.S | re.I)
-    if m:
-        snippet = m.group(1).strip()
-
-    chat = LocalChat(base_url=base_url, model=model, api_key=api_key)
+    llm_cache = response_cache_from_config(llm_cfg)
+    chat = LocalChat(base_url=base_url, model=model, api_key=api_key, cache=llm_cache)
+    t0 = time.perf_counter()
     final = chat.chat(
         SYSTEM_DEFAULT,
-        PROMPT_HAZARD_CLASSIFY.format(context=context, snippet=snippet),
+        prompt,
         temperature=temperature,
         max_tokens=max_tokens,
+        stream=stream,
+        stop_after_answer=stop_after_answer,
     ).strip()
+    timings["llm_sec"] = round(time.perf_counter() - t0, 6)
+    timings["llm_ttft_sec"] = chat.last_stream.get("ttft_sec")
+    usage = chat.last_usage
+    cached_tokens = _cached_prompt_tokens(usage, chat.last_timings)
+    prompt_tokens = usage.get("prompt_tokens")
 
+    t0 = time.perf_counter()
     c_count = count_inline_citations(final)
+    timings["parse_sec"] = round(time.perf_counter() - t0, 6)
+    timings["total_sec"] = round(time.perf_counter() - t_start, 6)
     return {
         "final": final,
         "contexts": {"pass1": per_corpus, "pass2": {}},
@@ -688,29 +2094,342 @@ def run_simple_rag_hazard_one_shot(req: Dict[str, Any]) -> Dict[str, Any]:
             "has_min_citations": bool(c_count >= min_citations),
             "uses_retrieval": True,
             "llm_calls": 1,
+            "index_cache": index_cache,
+            "card_profile": card_profile,
+            "index_profile": index_profile,
+            **query_stats,
+            "fast_path": fast_path,
+            "token_budget": token_budget,
+            "min_score": min_score,
+            "rel_score": rel_score,
+            **ctx_stats,
+            "prompt_tokens_est": _estimate_tokens(SYSTEM_DEFAULT) + _estimate_tokens(prompt),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": usage.get("completion_tokens"),
+            "prompt_layout": prompt_layout,
+            "catalogue": catalogue_mode if catalogue else "",
+            "catalogue_tokens_est": _estimate_tokens(catalogue),
+            "cached_prompt_tokens": cached_tokens,
+            "prompt_cache_hit_ratio": (
+                round(cached_tokens / prompt_tokens, 4) if cached_tokens is not None and prompt_tokens else None
+            ),
+            "llm_stream": stream,
+            "llm_ttft_sec": chat.last_stream.get("ttft_sec"),
+            "llm_early_stopped": bool(chat.last_stream.get("early_stopped")),
+            "llm_cache": cache_metrics(llm_cache, chat),
+            "timings": timings,
         },
         "meta": {"mode": "simple_rag_hazard_one_shot", "model": model, "base_url": base_url, "question": question},
     }
 
 
+# =============================================================================
+# Server mode (warm indexes, request.json in -> result JSON out)
+# =============================================================================
+
+class _ClassifyHandler(BaseHTTPRequestHandler):
+    """
+    POST /classify  body: request.json payload -> run_simple_rag_hazard_one_shot result
+    GET  /health    -> {"status": "ok", "indexes": [...]}
+    """
+
+    server_version = "simple-rag/1"
+
+    def _send_json(self, status: int, obj: Any) -> None:
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") != "/health":
+            self._send_json(404, {"error": f"unknown path: {self.path}"})
+            return
+        self._send_json(200, {"status": "ok", "indexes": self.server.index_pool.describe()})
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") not in ("", "/classify"):
+            self._send_json(404, {"error": f"unknown path: {self.path}"})
+            return
+        try:
+            n = int(self.headers.get("Content-Length") or 0)
+            req = json.loads(self.rfile.read(n).decode("utf-8").lstrip("\ufeff") or "null")
+            if not isinstance(req, dict):
+                raise ValueError("request body must be a JSON object (request.json schema)")
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        try:
+            res = run_simple_rag_hazard_one_shot(req, pool=self.server.index_pool)
+        except (ValueError, FileNotFoundError, IsADirectoryError) as e:
+            self._send_json(400, {"error": f"{type(e).__name__}: {e}"})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, res)
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) tuple
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        sys.stderr.write(f"[simple-rag] {self.address_string()} {format % args}\n")
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(
+    *,
+    host: str,
+    port: int,
+    unix_socket: str = "",
+    preload: Optional[Dict[str, Any]] = None,
+    use_cache: bool = DEFAULT_INDEX_CACHE,
+    max_indexes: int = DEFAULT_INDEX_POOL_MAX,
+) -> None:
+    pool = IndexPool(use_cache=use_cache, max_entries=max_indexes)
+    ret_cfg = (preload or {}).get("retrieval") or {}
+    profiles = {
+        "card_profile": str(ret_cfg.get("card_profile", DEFAULT_CARD_PROFILE)),
+        "index_profile": str(ret_cfg.get("index_profile", DEFAULT_INDEX_PROFILE)),
+    }
+    for corpus_name, source in ((preload or {}).get("corpora") or {}).items():
+        idx, status = pool.get(corpus_name, source, **profiles)
+        n = len(idx.items) if idx is not None else 0
+        sys.stderr.write(f"[simple-rag] preloaded {corpus_name}: {n} docs ({status})\n")
+
+    srv: socketserver.BaseServer
+    if unix_socket:
+        sock = Path(unix_socket)
+        if sock.exists():
+            sock.unlink()
+        srv = _UnixHTTPServer(str(sock), _ClassifyHandler)
+        where = f"unix:{sock}"
+    else:
+        srv = ThreadingHTTPServer((host, port), _ClassifyHandler)
+        where = f"http://{host}:{port}"
+    srv.index_pool = pool  # type: ignore[attr-defined]
+
+    sys.stderr.write(f"[simple-rag] serving on {where} (POST /classify, GET /health)\n")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        if unix_socket:
+            try:
+                Path(unix_socket).unlink()
+            except OSError:
+                pass
+
+
+# =============================================================================
+# Self-test (snippet queries, sparse BM25 scorer vs. the BM25Okapi reference)
+# =============================================================================
+
+_REPO_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+DEFAULT_SELF_TEST_KNOWLEDGE = str(_REPO_DATA_DIR / "hazard_cards.json")
+DEFAULT_SELF_TEST_TESTCASES = (
+    str(_REPO_DATA_DIR / "scoring" / "testcases.json"),
+    str(_REPO_DATA_DIR / "scoring" / "autoscoring-testcases.json"),
+)
+SELF_TEST_RTOL = 1e-9
+SELF_TEST_ATOL = 1e-9
+# edge cases next to the testcase questions: no tokens, unknown term only, repeated tokens
+_SELF_TEST_EXTRA_QUERIES = ("", "zzzunknownterm", "blackout blackout blackout power")
+# ranking checks run at these k (plus top_k) so that the partial selection (k < docs) is covered
+SELF_TEST_TOP_KS = (1, 5, 50)
+# cards appended a second time to build an index with exactly tied scores
+SELF_TEST_DUPLICATES = 50
+# testcase template fragments that must never reach a snippet-mode query
+_SELF_TEST_TEMPLATE_STRINGS = (
+    "Hazard classification (Top-1)",
+    "Use ONLY CONTEXT",
+    "Output requirements",
+    "ADDITIONAL REQUIREMENTS",
+    "SNIPPET:",
+    "Direct Answer",
+    '"hazard_id"',
+    "Do not add any additional text",
+    "operator-style report",
+    "Observed anomalies",
+    "close alternatives",
+    "What would confirm/deny",
+    "Detailed Report",
+)
+
+
+def self_test(
+    knowledge: str = DEFAULT_SELF_TEST_KNOWLEDGE,
+    testcase_files: Tuple[str, ...] = DEFAULT_SELF_TEST_TESTCASES,
+    *,
+    top_k: int = DEFAULT_TOP_K["Knowledge"],
+) -> Dict[str, Any]:
+    """
+    Checks that snippet-mode queries of every testcase question (with and without its SNIPPET:
+    marker) contain no _SELF_TEST_TEMPLATE_STRINGS, then BM25Index against
+    self.bm25.get_scores (BM25Okapi) on the Knowledge corpus for every testcase question in both
+    query modes, plus edge-case queries:
+      - scores: all documents within SELF_TEST_RTOL / SELF_TEST_ATOL
+      - ranking, at each k of SELF_TEST_TOP_KS and top_k: the top k by sparse score equal those
+        by reference score (stable argsort), and search() / retrieve_many() return exactly the
+        first k of a stable argsort of the sparse scores
+    The scoring checks run on the cards and again with SELF_TEST_DUPLICATES cards duplicated,
+    which puts exact ties inside and at the edge of the top k.
+    Returns a summary; `failures` lists every violated check (empty on success).
+    """
+    idx, _status = build_corpus_index("Knowledge", knowledge, use_cache=False)
+    if idx is None:
+        raise ValueError(f"self-test: no Knowledge items in {knowledge}")
+    questions: List[str] = []
+    for path in testcase_files:
+        raw = _read_json_flexible(path, corpus_name="testcases")
+        cases = raw.get("testcases") if isinstance(raw, dict) else raw
+        questions.extend(str(tc.get("question") or "") for tc in cases or [] if isinstance(tc, dict))
+    failures: List[str] = []
+    for qi, q in enumerate(questions):
+        for variant, text in (("marker", q), ("no marker", q.replace("SNIPPET:", ""))):
+            leaked = [t for t in _SELF_TEST_TEMPLATE_STRINGS if t in retrieval_query(text, "snippet")]
+            if leaked:
+                failures.append(f"question {qi} ({variant}): snippet query keeps template text {leaked}")
+    queries = [retrieval_query(q, mode) for q in questions for mode in QUERY_MODES]
+    queries.extend(_SELF_TEST_EXTRA_QUERIES)
+
+    ks = sorted({min(int(k), len(idx.items)) for k in (*SELF_TEST_TOP_KS, top_k)})
+    diffs = [_self_test_index(idx, queries, ks, "cards", failures)]
+    # duplicated cards score exactly alike: ties inside and at the edge of every top-k
+    tied = BM25Index(idx.items + [replace(it) for it in idx.items[:SELF_TEST_DUPLICATES]])
+    diffs.append(_self_test_index(tied, queries, ks, "cards+duplicates", failures))
+    return {
+        "knowledge": knowledge,
+        "docs": len(idx.items),
+        "questions": len(questions),
+        "queries": len(queries),
+        "top_k": ks,
+        "max_abs_score_diff": max(diffs),
+        "failures": failures,
+    }
+
+
+def _self_test_index(idx: BM25Index, queries: List[str], ks: List[int], label: str, failures: List[str]) -> float:
+    """Score and ranking checks of self_test() for one index; returns the max abs score difference."""
+    pos = {id(it): i for i, it in enumerate(idx.items)}
+    max_abs_diff = 0.0
+    batched = {k: idx.retrieve_many(queries, k, min_score=-np.inf) for k in ks}
+    for qi, query in enumerate(queries):
+        toks = _tokenize(query)
+        ref = np.asarray(idx.bm25.get_scores(toks), dtype=np.float64)
+        new = idx.get_scores(toks)
+        diff = float(np.max(np.abs(new - ref))) if ref.size else 0.0
+        max_abs_diff = max(max_abs_diff, diff)
+        if not np.allclose(new, ref, rtol=SELF_TEST_RTOL, atol=SELF_TEST_ATOL):
+            failures.append(f"{label} query {qi}: scores differ (max abs diff {diff:.3g})")
+            continue
+        ref_order = np.argsort(-ref, kind="stable")
+        new_order = np.argsort(-new, kind="stable")
+        for k in ks:
+            if not np.array_equal(new_order[:k], ref_order[:k]):
+                failures.append(f"{label} query {qi}: top-{k} ranking differs from BM25Okapi")
+            if not toks:
+                continue
+            # the selection must return exactly the first k of a stable argsort of its scores
+            for name, hits in (("search", idx.search(query, k, min_score=-np.inf)[0]), ("retrieve_many", batched[k][qi])):
+                got = np.asarray([pos[id(it)] for it, _sc in hits], dtype=np.int64)
+                if not np.array_equal(got, new_order[:k]):
+                    failures.append(f"{label} query {qi}: {name} top-{k} order differs from a stable argsort")
+    return max_abs_diff
+
+
 # =============================================================================
 # CLI
 # =============================================================================
 
 def main() -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--input", required=True, help="Path to request.json")
+    ap.add_argument("--input", default="", help="Path to request.json (with --serve: optional corpora preload)")
     ap.add_argument("--base_url", default="", help="Override base_url")
     ap.add_argument("--model", default="", help="Override model")
     ap.add_argument("--out", default="", help="Optional output JSON path")
     ap.add_argument("--out_md", default="", help="Optional output Markdown path")
+    ap.add_argument("--llm_cache_dir", default="", help="Directory of the on-disk LLM response cache (off if empty)")
+    ap.add_argument("--llm_cache_max_mb", type=float, default=0, help="Size bound of the response cache (LRU eviction; negative = unbounded)")
+    ap.add_argument("--llm_cache_replay", action="store_true", help="Answer only from the response cache; a miss is an error")
+    ap.add_argument("--no_index_cache", action="store_true", help="Do not read/write on-disk BM25 index caches")
+    ap.add_argument("--prompt_layout", default="", choices=["", *PROMPT_LAYOUTS], help="Override retrieval.prompt_layout")
+    ap.add_argument("--catalogue", default="", choices=["", *CATALOGUE_MODES], help="Override retrieval.catalogue (cacheable layout)")
+    ap.add_argument("--fast_path", action="store_true", help="Answer unambiguous alias matches without the LLM")
+    ap.add_argument("--card_profile", default="", choices=["", *CARD_PROFILES], help="Override retrieval.card_profile (prompt view of hazard cards)")
+    ap.add_argument("--index_profile", default="", choices=["", *CARD_PROFILES], help="Override retrieval.index_profile (BM25 view of hazard cards)")
+    ap.add_argument("--adaptive_k", default="", choices=["", *ADAPTIVE_K_MODES], help="Override retrieval.adaptive_k (cut BM25 hits at the score knee / mass)")
+    ap.add_argument("--query_mode", default="", choices=["", *QUERY_MODES], help="Override retrieval.query_mode (BM25 query: snippet or full question)")
+    ap.add_argument("--stream", action="store_true", help="Stream the completion (records TTFT)")
+    ap.add_argument("--stop_after_answer", action="store_true", help="Stream and stop once the Direct Answer JSON is complete")
+    ap.add_argument("--serve", action="store_true", help="Run as a long-lived server with warm indexes")
+    ap.add_argument("--host", default="127.0.0.1", help="Server bind address (--serve)")
+    ap.add_argument("--port", type=int, default=8765, help="Server port (--serve)")
+    ap.add_argument("--unix_socket", default="", help="Serve on this Unix socket path instead of TCP (--serve)")
+    ap.add_argument("--max_indexes", type=int, default=DEFAULT_INDEX_POOL_MAX, help="Warm indexes kept, LRU-evicted (--serve)")
+    ap.add_argument("--self_test", action="store_true", help="Check the sparse BM25 scorer against BM25Okapi on the repo's cards and testcases, then exit")
     args = ap.parse_args()
 
+    if args.self_test:
+        result = self_test()
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 1 if result["failures"] else 0
+
+    if args.serve:
+        preload = _read_json_flexible(args.input, corpus_name="request") if args.input else None
+        serve(
+            host=args.host,
+            port=args.port,
+            unix_socket=args.unix_socket,
+            preload=preload if isinstance(preload, dict) else None,
+            use_cache=not args.no_index_cache,
+            max_indexes=args.max_indexes,
+        )
+        return 0
+
+    if not args.input:
+        ap.error("--input is required (unless --serve or --self_test)")
+
     req = _read_json_flexible(args.input, corpus_name="request")
     if args.base_url:
         req.setdefault("llm", {})["base_url"] = args.base_url
     if args.model:
         req.setdefault("llm", {})["model"] = args.model
+    if args.llm_cache_dir:
+        req.setdefault("llm", {})["cache_dir"] = args.llm_cache_dir
+    if args.llm_cache_max_mb:
+        req.setdefault("llm", {})["cache_max_mb"] = args.llm_cache_max_mb
+    if args.llm_cache_replay:
+        req.setdefault("llm", {})["cache_replay"] = True
+    if args.no_index_cache:
+        req.setdefault("retrieval", {})["index_cache"] = False
+    if args.prompt_layout:
+        req.setdefault("retrieval", {})["prompt_layout"] = args.prompt_layout
+    if args.catalogue:
+        req.setdefault("retrieval", {})["catalogue"] = args.catalogue
+    if args.fast_path:
+        req.setdefault("retrieval", {})["fast_path"] = True
+    if args.card_profile:
+        req.setdefault("retrieval", {})["card_profile"] = args.card_profile
+    if args.index_profile:
+        req.setdefault("retrieval", {})["index_profile"] = args.index_profile
+    if args.query_mode:
+        req.setdefault("retrieval", {})["query_mode"] = args.query_mode
+    if args.adaptive_k:
+        req.setdefault("retrieval", {})["adaptive_k"] = args.adaptive_k
+    if args.stream or args.stop_after_answer:
+        req.setdefault("llm", {})["stream"] = True
+    if args.stop_after_answer:
+        req.setdefault("llm", {})["stop_after_answer"] = True
 
     res = run_simple_rag_hazard_one_shot(req)
 
@@ -8,12 +8,16 @@ Runs the same testcase suite with multiple METHODS:
 - simple_rag -> calls external script simple-rag.py via subprocess (retrieval baseline)
 - llm_only   -> calls external script llm.py via subprocess (NO retrieval baseline)
 
+With --in_process both scripts are imported once instead (one subprocess per case otherwise) and
+simple-rag.py's BM25 indexes stay warm across the suite; on-disk outputs are the same.
+
 Outputs:
 out_dir/<timestamp>/<method>/<model>/<TC...>/{request.json,result.json,report.md}
 
 Also writes:
-- summary.jsonl / summary.csv
+- summary.jsonl / summary.csv   (incl. per-stage t_*_sec timings and prompt size counters)
 - report_final_answers_wide.csv  (final answers side-by-side per testcase+model, with folder path)
+- latency_summary.csv / .json    (elapsed_sec p50/p95/p99, totals, histogram, tokens/s per method+model)
 
 Usage example:
 python3 simplerag-scenario-test-hazard.py \
@@ -41,12 +45,17 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
+import importlib.util
 import json
 import os
 import re
 import subprocess
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -251,6 +260,8 @@ def _build_request(
     environment_path: Path,
     memory_path: Path,
     ops_state_corpus: Optional[Dict[str, Any]] = None,
+    token_budget: int = 0,
+    llm_cache: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     corpora: Dict[str, Any] = {
         "Knowledge": str(knowledge_path) if knowledge_path.exists() else {"items": []},
@@ -261,20 +272,28 @@ def _build_request(
     if isinstance(ops_state_corpus, dict) and isinstance(ops_state_corpus.get("items"), list) and ops_state_corpus["items"]:
         corpora["OpsState"] = ops_state_corpus
 
+    retrieval: Dict[str, Any] = {
+        "top_k": top_k,
+        "recent_k": recent_k,
+        "per_doc_chars": per_doc_chars,
+    }
+    if token_budget > 0:
+        retrieval["token_budget"] = token_budget
+
+    llm: Dict[str, Any] = {
+        "base_url": base_url,
+        "model": model,
+        "api_key": api_key,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if llm_cache:
+        llm.update(llm_cache)
+
     return {
         "question": question,
-        "llm": {
-            "base_url": base_url,
-            "model": model,
-            "api_key": api_key,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        },
-        "retrieval": {
-            "top_k": top_k,
-            "recent_k": recent_k,
-            "per_doc_chars": per_doc_chars,
-        },
+        "llm": llm,
+        "retrieval": retrieval,
         "corpora": corpora,
         # kept for request-compatibility; baseline runner does not use it
         "judge": {"enabled": False},
@@ -293,6 +312,48 @@ def _render_md(result: Dict[str, Any]) -> str:
         f"{result.get('final','')}\n"
     )
 
+# -----------------------------
+# In-process execution (--in_process)
+# -----------------------------
+
+# one-shot entry points of the method scripts (llm.py / autoscoring-llm.py use different names)
+_SCRIPT_ENTRY_POINTS = ("run_simple_rag_hazard_one_shot", "run_llm_memory_rag_one_shot", "run_llm_keywords_one_shot")
+
+
+def _load_script_module(path: Path) -> Any:
+    """Imports a (hyphenated) method script once so its one-shot entry point can be called directly."""
+    name = "_runner_" + _sanitize(path.stem).replace("-", "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot import script: {path}")
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod  # dataclasses look their module up in sys.modules
+    spec.loader.exec_module(mod)
+    if not any(hasattr(mod, n) for n in _SCRIPT_ENTRY_POINTS):
+        raise ImportError(f"{path} has none of the entry points {_SCRIPT_ENTRY_POINTS}")
+    return mod
+
+
+def _run_script_in_process(
+    mod: Any, script_name: str, req_path: Path, tmp_out: Path, tmp_md: Path, **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    In-process equivalent of `python3 <script> --input req_path --out tmp_out --out_md tmp_md`:
+    the request is read back from request.json and both outputs are serialized exactly like the
+    script's CLI. Pooled indexes report the index_cache status a subprocess would ("hit" once
+    built), so run folders match subprocess runs except for the measured timings.
+    """
+    entry = next(getattr(mod, n) for n in _SCRIPT_ENTRY_POINTS if hasattr(mod, n))
+    try:
+        req = json.loads(req_path.read_text(encoding="utf-8"))
+        res = entry(req, **kwargs)
+        txt = json.dumps(res, ensure_ascii=False, indent=2)
+        tmp_out.write_text(txt, encoding="utf-8")
+        tmp_md.write_text(mod.render_markdown(res), encoding="utf-8")
+    except Exception as e:
+        raise RuntimeError(f"{script_name} failed: {type(e).__name__}: {e}") from e
+    return json.loads(txt)
+
 
 def _clean_for_csv(s: Any) -> str:
     if s is None:
@@ -301,6 +362,132 @@ def _clean_for_csv(s: Any) -> str:
     return t.replace("\r\n", "\n").replace("\r", "\n")
 
 
+# summary column -> result.metrics.timings key (per-corpus dicts are summed)
+STAGE_COLUMNS = {
+    "t_load_sec": "load_sec",
+    "t_index_sec": "index_build_sec",
+    "t_retrieval_sec": "retrieval_sec",
+    "t_context_sec": "context_format_sec",
+    "t_llm_ttft_sec": "llm_ttft_sec",
+    "t_llm_sec": "llm_sec",
+    "t_parse_sec": "parse_sec",
+    "t_total_sec": "total_sec",
+}
+SIZE_COLUMNS = ["context_chars", "prompt_tokens_est", "prompt_tokens", "completion_tokens"]
+
+
+def _stage_columns(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Flattens result.metrics into the summary's t_*_sec and size columns (missing stages: None)."""
+    timings = metrics.get("timings") or {}
+    out: Dict[str, Any] = {}
+    for col, key in STAGE_COLUMNS.items():
+        v = timings.get(key)
+        if isinstance(v, dict):
+            v = sum(float(x or 0.0) for x in v.values())
+        out[col] = None if v is None else round(float(v), 6)
+    for col in SIZE_COLUMNS:
+        out[col] = metrics.get(col)
+    return out
+
+
+# -----------------------------
+# Latency summary
+# -----------------------------
+
+# upper bucket edges (seconds) of the elapsed_sec histogram; the last bucket is open-ended
+LATENCY_HIST_EDGES = [0.1, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300]
+
+
+def _percentile(xs: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile (numpy's default method); None for no values."""
+    if not xs:
+        return None
+    s = sorted(xs)
+    pos = (len(s) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(s) - 1)
+    return round(s[lo] + (s[hi] - s[lo]) * (pos - lo), 6)
+
+
+def _latency_summary(records: List[Dict[str, Any]], *, wall_sec: float, workers: int) -> Dict[str, Any]:
+    """
+    Aggregates summary records per method × model: elapsed_sec percentiles/totals/histogram over
+    ok runs, LLM and retrieval stage percentiles, token totals and throughput. Rows without stage
+    or token columns (older runs, fast-path answers) are skipped for those stats only.
+    """
+
+    def _vals(rows: List[Dict[str, Any]], col: str) -> List[float]:
+        return [float(r[col]) for r in rows if r.get(col) not in (None, "")]
+
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for r in records:
+        groups.setdefault((str(r.get("method", "")), str(r.get("model", ""))), []).append(r)
+
+    out: List[Dict[str, Any]] = []
+    for (method, model), rows in sorted(groups.items()):
+        ok = [r for r in rows if r.get("ok")]
+        elapsed = _vals(ok, "elapsed_sec")
+        total = sum(elapsed)
+        g: Dict[str, Any] = {"method": method, "model": model, "n": len(rows), "n_ok": len(ok)}
+        g["elapsed_total_sec"] = round(total, 3)
+        g["elapsed_mean_sec"] = round(total / len(elapsed), 6) if elapsed else None
+        for q in (50, 95, 99):
+            g[f"elapsed_p{q}_sec"] = _percentile(elapsed, q)
+        g["elapsed_max_sec"] = max(elapsed) if elapsed else None
+        for col, name in (("t_llm_sec", "llm"), ("t_llm_ttft_sec", "llm_ttft"), ("t_retrieval_sec", "retrieval")):
+            vals = _vals(ok, col)
+            g[f"{name}_p50_sec"] = _percentile(vals, 50)
+            g[f"{name}_p95_sec"] = _percentile(vals, 95)
+        g["prompt_tokens_total"] = int(sum(_vals(ok, "prompt_tokens")))
+        g["completion_tokens_total"] = int(sum(_vals(ok, "completion_tokens")))
+        # decode throughput over the runs that report both completion tokens and LLM time
+        timed = [r for r in ok if r.get("completion_tokens") not in (None, "") and r.get("t_llm_sec") not in (None, "")]
+        llm_total = sum(float(r["t_llm_sec"]) for r in timed)
+        g["completion_tokens_per_sec"] = (
+            round(sum(float(r["completion_tokens"]) for r in timed) / llm_total, 3) if llm_total > 0 else None
+        )
+        # cases per second of serial case time (wall time is shared by all groups with --workers)
+        g["cases_per_sec"] = round(len(elapsed) / total, 4) if total > 0 else None
+        hist = [0] * (len(LATENCY_HIST_EDGES) + 1)
+        for x in elapsed:
+            hist[bisect.bisect_left(LATENCY_HIST_EDGES, x)] += 1
+        g["hist"] = hist
+        out.append(g)
+
+    n_ok = sum(g["n_ok"] for g in out)
+    return {
+        "run": {
+            "wall_sec": round(wall_sec, 3),
+            "workers": workers,
+            "n": len(records),
+            "n_ok": n_ok,
+            "cases_per_sec": round(n_ok / wall_sec, 4) if wall_sec > 0 else None,
+        },
+        "hist_edges_sec": LATENCY_HIST_EDGES,
+        "groups": out,
+    }
+
+
+def _write_latency_summary(out_root: Path, summary: Dict[str, Any]) -> Tuple[Path, Path]:
+    """latency_summary.json (as is) + latency_summary.csv (one row per method × model)."""
+    json_path = out_root / "latency_summary.json"
+    csv_path = out_root / "latency_summary.csv"
+    _write_json(json_path, summary)
+
+    edges = summary["hist_edges_sec"]
+    hist_fields = [f"hist_le_{e:g}s" for e in edges] + [f"hist_gt_{edges[-1]:g}s"]
+    groups = summary["groups"]
+    fields = [k for k in (groups[0] if groups else {}) if k != "hist"] + hist_fields
+    with csv_path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields, quoting=csv.QUOTE_ALL)
+        w.writeheader()
+        for g in groups:
+            row = {k: v for k, v in g.items() if k != "hist"}
+            row.update(zip(hist_fields, g["hist"]))
+            w.writerow(row)
+    return json_path, csv_path
+
+
 def _write_wide_report_csv(
     out_root: Path,
     methods: List[str],
@@ -369,6 +556,12 @@ def main() -> int:
     ap.add_argument("--max_tokens", type=int, default=131072)
     ap.add_argument("--temperature", type=float, default=0.2)
     ap.add_argument("--per_doc_chars", type=int, default=1200)
+    ap.add_argument("--token_budget", type=int, default=0, help="simple_rag prompt token budget (0 = fixed top_k)")
+    ap.add_argument("--in_process", action="store_true", help="Import the method scripts once and share warm indexes instead of one subprocess per case")
+    ap.add_argument("--workers", type=int, default=1, help="Run up to N cases concurrently (outputs keep the sequential order)")
+    ap.add_argument("--llm_cache_dir", default="", help="On-disk LLM response cache shared by all methods (off if empty)")
+    ap.add_argument("--llm_cache_max_mb", type=float, default=0, help="Size bound of the response cache (LRU eviction; negative = unbounded)")
+    ap.add_argument("--llm_cache_replay", action="store_true", help="Answer only from the response cache (offline regression run)")
 
     ap.add_argument("--top_k", default="Knowledge=250,Memory=250,Experiences=250,Environment=250,OpsState=250")
     ap.add_argument("--recent_k", default="Memory=250,Environment=250,OpsState=250,Knowledge=250,Experiences=250")
@@ -403,7 +596,33 @@ def main() -> int:
     if "llm_only" in methods and not llm_only_script.exists():
         raise FileNotFoundError(f"--llm_only_script not found: {llm_only_script}")
 
+    # --in_process: scripts imported once; simple-rag.py's IndexPool and llm.py's MemoryIndexPool
+    # keep corpora warm for the suite
+    simple_rag_mod: Any = None
+    llm_only_mod: Any = None
+    index_pool: Any = None
+    llm_only_kwargs: Dict[str, Any] = {}
+    if args.in_process:
+        if "simple_rag" in methods:
+            simple_rag_mod = _load_script_module(simple_rag_script)
+            index_pool = simple_rag_mod.IndexPool()
+        if "llm_only" in methods:
+            llm_only_mod = _load_script_module(llm_only_script)
+            if hasattr(llm_only_mod, "MemoryIndexPool"):
+                llm_only_kwargs["pool"] = llm_only_mod.MemoryIndexPool()
+
     top_k = _parse_kv(args.top_k)
+
+    # response cache settings, forwarded to the method scripts through request.json ("llm" block)
+    llm_cache: Dict[str, Any] = {}
+    if args.llm_cache_dir:
+        llm_cache["cache_dir"] = str(args.llm_cache_dir)
+        if args.llm_cache_max_mb:
+            llm_cache["cache_max_mb"] = float(args.llm_cache_max_mb)
+        if args.llm_cache_replay:
+            llm_cache["cache_replay"] = True
+    elif args.llm_cache_replay:
+        raise ValueError("--llm_cache_replay requires --llm_cache_dir")
     recent_k = _parse_kv(args.recent_k)
 
     # models
@@ -443,6 +662,7 @@ def main() -> int:
             raise ValueError("--select filter removed all testcases (no matching IDs).")
 
     ops_state_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+    ops_state_lock = threading.Lock()
 
     summary_jsonl = out_root / "summary.jsonl"
     summary_csv = out_root / "summary.csv"
@@ -458,171 +678,195 @@ def main() -> int:
         "ops_state_missing",
         "ok",
         "elapsed_sec",
+        *STAGE_COLUMNS,
+        *SIZE_COLUMNS,
         "error",
         "out_dir",
     ]
 
     final_matrix: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
 
-    with summary_csv.open("w", encoding="utf-8", newline="") as fcsv:
+    def _run_case(method: str, model: str, tc: TestCase) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Runs one (method, model, testcase); returns its summary record and wide-report entry."""
+        tc_mem = Path(tc.memory_file)
+        if not tc_mem.is_absolute():
+            tc_mem = memory_dir / tc_mem
+
+        run_ts = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+        run_folder = out_root / method / _sanitize(model) / f"{tc.id}__{_sanitize(tc.name)}"
+        _safe_mkdir(run_folder)
+
+        record: Dict[str, Any] = {
+            "timestamp_utc": run_ts,
+            "method": method,
+            "model": model,
+            "testcase_id": tc.id,
+            "testcase_name": tc.name,
+            "memory_file": str(tc_mem),
+            "ops_state_file": "",
+            "ops_state_missing": False,
+            "ok": False,
+            "elapsed_sec": None,
+            **{col: None for col in (*STAGE_COLUMNS, *SIZE_COLUMNS)},
+            "error": None,
+            "out_dir": str(run_folder),
+        }
+
+        matrix_entry = {"ok": False, "folder": str(run_folder), "final": ""}
+
+        if not tc_mem.exists():
+            record["error"] = f"memory file not found: {tc_mem}"
+            return record, matrix_entry
+
+        question = (tc.focus_prefix or "") + (tc.question or "").strip()
+
+        # Resolve ops_state strictly by timestamp (used by simple_rag; harmless for llm_only)
+        ops_state_corpus: Optional[Dict[str, Any]] = None
+        ops_path = _resolve_ops_state_path_timestamp_only(tc_mem=tc_mem, ops_state_dir=ops_state_dir)
+        if ops_path:
+            record["ops_state_file"] = str(ops_path)
+            cache_key = str(ops_path)
+            with ops_state_lock:
+                if cache_key in ops_state_cache:
+                    ops_state_corpus = ops_state_cache[cache_key]
+                else:
+                    try:
+                        ops_obj = _load_ops_state(cache_key)
+                        ops_state_corpus = _normalize_ops_state_to_corpus(ops_obj)
+                    except Exception:
+                        ops_state_corpus = None
+                    ops_state_cache[cache_key] = ops_state_corpus
+        else:
+            record["ops_state_missing"] = True
+
+        req = _build_request(
+            question=question,
+            base_url=base_url,
+            api_key=api_key,
+            model=model,
+            max_tokens=int(args.max_tokens),
+            temperature=float(args.temperature),
+            per_doc_chars=int(args.per_doc_chars),
+            top_k=top_k,
+            recent_k=recent_k,
+            knowledge_path=knowledge_path,
+            experiences_path=experiences_path,
+            environment_path=environment_path,
+            memory_path=tc_mem,
+            ops_state_corpus=ops_state_corpus,
+            token_budget=int(args.token_budget),
+            llm_cache=llm_cache,
+        )
+
+        req_path = run_folder / "request.json"
+        res_path = run_folder / "result.json"
+        md_path = run_folder / "report.md"
+        _write_json(req_path, req)
+
+        t0 = time.time()
+        result: Dict[str, Any] = {}
+
+        try:
+            if method == "simple_rag":
+                tmp_out = run_folder / "simple_rag_result.json"
+                tmp_md = run_folder / "simple_rag_report.md"
+                if simple_rag_mod is not None:
+                    result = _run_script_in_process(simple_rag_mod, "simple-rag.py", req_path, tmp_out, tmp_md, pool=index_pool)
+                else:
+                    cmd = [
+                        "python3",
+                        str(simple_rag_script),
+                        "--input",
+                        str(req_path),
+                        "--out",
+                        str(tmp_out),
+                        "--out_md",
+                        str(tmp_md),
+                    ]
+                    p = subprocess.run(cmd, capture_output=True, text=True)
+                    if p.returncode != 0:
+                        raise RuntimeError(f"simple-rag.py failed: {p.stderr.strip() or p.stdout.strip()}")
+                    result = json.loads(tmp_out.read_text(encoding="utf-8"))
+                result.setdefault("meta", {})
+                result["meta"].update({"method": "simple_rag", "model": model, "base_url": base_url, "question": question})
+
+            else:  # llm_only
+                tmp_out = run_folder / "llm_only_result.json"
+                tmp_md = run_folder / "llm_only_report.md"
+                if llm_only_mod is not None:
+                    result = _run_script_in_process(llm_only_mod, "llm.py", req_path, tmp_out, tmp_md, **llm_only_kwargs)
+                else:
+                    cmd = [
+                        "python3",
+                        str(llm_only_script),
+                        "--input",
+                        str(req_path),
+                        "--out",
+                        str(tmp_out),
+                        "--out_md",
+                        str(tmp_md),
+                    ]
+                    p = subprocess.run(cmd, capture_output=True, text=True)
+                    if p.returncode != 0:
+                        raise RuntimeError(f"llm.py failed: {p.stderr.strip() or p.stdout.strip()}")
+                    result = json.loads(tmp_out.read_text(encoding="utf-8"))
+                result.setdefault("meta", {})
+                result["meta"].update({"method": "llm_only", "model": model, "base_url": base_url, "question": question})
+
+            elapsed = round(time.time() - t0, 3)
+
+            _write_json(res_path, result)
+            md_path.write_text(_render_md(result), encoding="utf-8")
+
+            record["ok"] = True
+            record["elapsed_sec"] = elapsed
+            record.update(_stage_columns(result.get("metrics") or {}))
+
+            final_text = _clean_for_csv(result.get("final", ""))
+            matrix_entry = {
+                "ok": True,
+                "folder": str(run_folder),
+                "final": final_text,
+            }
+
+        except Exception as e:
+            elapsed = round(time.time() - t0, 3)
+            record["ok"] = False
+            record["elapsed_sec"] = elapsed
+            record["error"] = f"{type(e).__name__}: {e}"
+            (run_folder / "error.txt").write_text(record["error"], encoding="utf-8")
+
+            matrix_entry = {
+                "ok": False,
+                "folder": str(run_folder),
+                "final": "",
+            }
+
+        return record, matrix_entry
+
+    # Cases run on a bounded pool (--workers); this thread is the only writer and consumes the
+    # results in submission order, so all outputs match a sequential run.
+    cases = [(method, model, tc) for method in methods for model in models for tc in testcases]
+
+    records: List[Dict[str, Any]] = []
+    t_run = time.perf_counter()
+    with summary_csv.open("w", encoding="utf-8", newline="") as fcsv, ThreadPoolExecutor(
+        max_workers=max(1, int(args.workers))
+    ) as executor:
         writer = csv.DictWriter(fcsv, fieldnames=csv_fields)
         writer.writeheader()
 
-        for method in methods:
-            for model in models:
-                for tc in testcases:
-                    tc_mem = Path(tc.memory_file)
-                    if not tc_mem.is_absolute():
-                        tc_mem = memory_dir / tc_mem
-
-                    run_ts = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-                    run_folder = out_root / method / _sanitize(model) / f"{tc.id}__{_sanitize(tc.name)}"
-                    _safe_mkdir(run_folder)
-
-                    record: Dict[str, Any] = {
-                        "timestamp_utc": run_ts,
-                        "method": method,
-                        "model": model,
-                        "testcase_id": tc.id,
-                        "testcase_name": tc.name,
-                        "memory_file": str(tc_mem),
-                        "ops_state_file": "",
-                        "ops_state_missing": False,
-                        "ok": False,
-                        "elapsed_sec": None,
-                        "error": None,
-                        "out_dir": str(run_folder),
-                    }
-
-                    final_matrix.setdefault((model, tc.id), {}).setdefault(method, {})
-                    final_matrix[(model, tc.id)][method] = {"ok": False, "folder": str(run_folder), "final": ""}
-
-                    if not tc_mem.exists():
-                        record["error"] = f"memory file not found: {tc_mem}"
-                        with summary_jsonl.open("a", encoding="utf-8") as fj:
-                            fj.write(json.dumps(record, ensure_ascii=False) + "\n")
-                        writer.writerow(record)
-                        fcsv.flush()
-                        continue
-
-                    question = (tc.focus_prefix or "") + (tc.question or "").strip()
-
-                    # Resolve ops_state strictly by timestamp (used by simple_rag; harmless for llm_only)
-                    ops_state_corpus: Optional[Dict[str, Any]] = None
-                    ops_path = _resolve_ops_state_path_timestamp_only(tc_mem=tc_mem, ops_state_dir=ops_state_dir)
-                    if ops_path:
-                        record["ops_state_file"] = str(ops_path)
-                        cache_key = str(ops_path)
-                        if cache_key in ops_state_cache:
-                            ops_state_corpus = ops_state_cache[cache_key]
-                        else:
-                            try:
-                                ops_obj = _load_ops_state(cache_key)
-                                ops_state_corpus = _normalize_ops_state_to_corpus(ops_obj)
-                            except Exception:
-                                ops_state_corpus = None
-                            ops_state_cache[cache_key] = ops_state_corpus
-                    else:
-                        record["ops_state_missing"] = True
-
-                    req = _build_request(
-                        question=question,
-                        base_url=base_url,
-                        api_key=api_key,
-                        model=model,
-                        max_tokens=int(args.max_tokens),
-                        temperature=float(args.temperature),
-                        per_doc_chars=int(args.per_doc_chars),
-                        top_k=top_k,
-                        recent_k=recent_k,
-                        knowledge_path=knowledge_path,
-                        experiences_path=experiences_path,
-                        environment_path=environment_path,
-                        memory_path=tc_mem,
-                        ops_state_corpus=ops_state_corpus,
-                    )
-
-                    req_path = run_folder / "request.json"
-                    res_path = run_folder / "result.json"
-                    md_path = run_folder / "report.md"
-                    _write_json(req_path, req)
-
-                    t0 = time.time()
-                    result: Dict[str, Any] = {}
+        futures = [executor.submit(_run_case, method, model, tc) for method, model, tc in cases]
+        for (method, model, tc), fut in zip(cases, futures):
+            record, matrix_entry = fut.result()
+            final_matrix.setdefault((model, tc.id), {})[method] = matrix_entry
 
-                    try:
-                        if method == "simple_rag":
-                            tmp_out = run_folder / "simple_rag_result.json"
-                            tmp_md = run_folder / "simple_rag_report.md"
-                            cmd = [
-                                "python3",
-                                str(simple_rag_script),
-                                "--input",
-                                str(req_path),
-                                "--out",
-                                str(tmp_out),
-                                "--out_md",
-                                str(tmp_md),
-                            ]
-                            p = subprocess.run(cmd, capture_output=True, text=True)
-                            if p.returncode != 0:
-                                raise RuntimeError(f"simple-rag.py failed: {p.stderr.strip() or p.stdout.strip()}")
-                            result = json.loads(tmp_out.read_text(encoding="utf-8"))
-                            result.setdefault("meta", {})
-                            result["meta"].update({"method": "simple_rag", "model": model, "base_url": base_url, "question": question})
-
-                        else:  # llm_only
-                            tmp_out = run_folder / "llm_only_result.json"
-                            tmp_md = run_folder / "llm_only_report.md"
-                            cmd = [
-                                "python3",
-                                str(llm_only_script),
-                                "--input",
-                                str(req_path),
-                                "--out",
-                                str(tmp_out),
-                                "--out_md",
-                                str(tmp_md),
-                            ]
-                            p = subprocess.run(cmd, capture_output=True, text=True)
-                            if p.returncode != 0:
-                                raise RuntimeError(f"llm.py failed: {p.stderr.strip() or p.stdout.strip()}")
-                            result = json.loads(tmp_out.read_text(encoding="utf-8"))
-                            result.setdefault("meta", {})
-                            result["meta"].update({"method": "llm_only", "model": model, "base_url": base_url, "question": question})
-
-                        elapsed = round(time.time() - t0, 3)
-
-                        _write_json(res_path, result)
-                        md_path.write_text(_render_md(result), encoding="utf-8")
-
-                        record["ok"] = True
-                        record["elapsed_sec"] = elapsed
-
-                        final_text = _clean_for_csv(result.get("final", ""))
-                        final_matrix[(model, tc.id)][method] = {
-                            "ok": True,
-                            "folder": str(run_folder),
-                            "final": final_text,
-                        }
-
-                    except Exception as e:
-                        elapsed = round(time.time() - t0, 3)
-                        record["ok"] = False
-                        record["elapsed_sec"] = elapsed
-                        record["error"] = f"{type(e).__name__}: {e}"
-                        (run_folder / "error.txt").write_text(record["error"], encoding="utf-8")
-
-                        final_matrix[(model, tc.id)][method] = {
-                            "ok": False,
-                            "folder": str(run_folder),
-                            "final": "",
-                        }
-
-                    with summary_jsonl.open("a", encoding="utf-8") as fj:
-                        fj.write(json.dumps(record, ensure_ascii=False) + "\n")
-                    writer.writerow(record)
-                    fcsv.flush()
+            with summary_jsonl.open("a", encoding="utf-8") as fj:
+                fj.write(json.dumps(record, ensure_ascii=False) + "\n")
+            writer.writerow(record)
+            fcsv.flush()
+            records.append(record)
+    run_wall_sec = time.perf_counter() - t_run
 
     report_path = _write_wide_report_csv(
         out_root=out_root,
@@ -631,11 +875,16 @@ def main() -> int:
         testcases=testcases,
         final_matrix=final_matrix,
     )
+    latency_json, latency_csv = _write_latency_summary(
+        out_root, _latency_summary(records, wall_sec=run_wall_sec, workers=max(1, int(args.workers)))
+    )
 
     print(f"Done. Results in: {out_root}")
     print(f"- {summary_jsonl}")
     print(f"- {summary_csv}")
     print(f"- {report_path}")
+    print(f"- {latency_csv}")
+    print(f"- {latency_json}")
     return 0
 
 